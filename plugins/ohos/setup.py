@@ -18,8 +18,6 @@
 
 from setuptools import setup
 
-INSTALL_REQUIRES = []
-
 
 def main():
     setup(name='xdevice-ohos',
@@ -34,37 +32,7 @@ def main():
                     'ohos.parser',
                     'ohos.testkit'
                     ],
-          entry_points={
-              'device': [
-                  'device=ohos.environment.device',
-                  'device_lite=ohos.environment.device_lite'
-              ],
-              'manager': [
-                  'manager=ohos.managers.manager_device',
-                  'manager_lite=ohos.managers.manager_lite'
-              ],
-              'driver': [
-                  'drivers=ohos.drivers.drivers',
-                  'drivers_lite=ohos.drivers.drivers_lite',
-                  'homevision=ohos.drivers.homevision',
-                  'kunpeng=ohos.drivers.kunpeng',
-                  'openharmony=ohos.drivers.openharmony'
-              ],
-              'listener': [
-                  'listener=ohos.executor.listener',
-              ],
-              'testkit': [
-                  'kit=ohos.testkit.kit',
-                  'kit_lite=ohos.testkit.kit_lite'
-              ],
-              'parser': [
-                  'parser_lite=ohos.parser.parser_lite',
-                  'parser=ohos.parser.parser'
-
-              ]
-          },
           zip_safe=False,
-          install_requires=INSTALL_REQUIRES,
           )
 
 
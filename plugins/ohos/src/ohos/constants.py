@@ -16,15 +16,11 @@
 # limitations under the License.
 #
 
-from dataclasses import dataclass
+__all__ = ("ComType", "HostDrivenTestType",
+           "ParserType", "DeviceLiteKernel", "CKit")
 
 
-__all__ = ["ComType", "HostDrivenTestType",
-           "ParserType", "DeviceLiteKernel", "CKit"]
-
-
-@dataclass
-class ComType(object):
+class ComType:
     """
     ComType enumeration
     """
@@ -32,8 +28,7 @@ class ComType(object):
     deploy_com = "deploy"
 
 
-@dataclass
-class HostDrivenTestType(object):
+class HostDrivenTestType:
     """
     HostDrivenType enumeration
     """
@@ -41,7 +36,6 @@ class HostDrivenTestType(object):
     windows_test = "WindowsTest"
 
 
-@dataclass
 class ParserType:
     ctest_lite = "CTestLite"
     cpp_test_lite = "CppTestLite"
@@ -51,8 +45,7 @@ class ParserType:
     jsuit_test_lite = "JSUnitTestLite"
 
 
-@dataclass
-class DeviceLiteKernel(object):
+class DeviceLiteKernel:
     """
     Lite device os enumeration
     """
@@ -60,7 +53,6 @@ class DeviceLiteKernel(object):
     lite_kernel = "lite"
 
 
-@dataclass
 class CKit:
     push = "PushKit"
     liteinstall = "LiteAppInstallKit"
@@ -24,7 +24,10 @@ import shutil
 import zipfile
 import tempfile
 import stat
+import threading
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 from xdevice import ParamError
@@ -59,6 +62,7 @@ from xdevice import reset_junit_para
 from xdevice import disable_keyguard
 from xdevice import unlock_screen
 from xdevice import unlock_device
+from xdevice import json_loads
 
 from ohos.environment.dmlib import process_command_ret
 from ohos.environment.dmlib import DisplayOutputReceiver
@@ -74,6 +78,62 @@ ON_DEVICE_TEST_DIR_LOCATION = "/%s/%s/%s/" % ("data", "local", "tmp")
 
 FAILED_RUN_TEST_ATTEMPTS = 3
 TIME_OUT = 900 * 1000
+RERUN_BATCH_SIZE = 16
+
+_XML_ESCAPES = {"&": "&amp;", "\"": "&quot;", "<": "&lt;", ">": "&gt;"}
+_XML_ESCAPE_PATTERN = re.compile(r'[&"<>]')
+_HILOG_PID_PATTERN = re.compile(
+    r"^\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3}\s+(\d+)")
+_SUITES_INFO_PATTERN = re.compile(r".+\[suites info]")
+_CREATE_REPORT_PATTERN = re.compile(r".*\[create report]*")
+# spellings of the ace log tag hilog writes, checked without lowering lines
+_ACE_LOG_TAG = "JSApp:"
+_ACE_LOG_LOWER_TAG = _ACE_LOG_MARKER + ":"
+_EMPTY_RESULT_TEMPLATE = '<?xml version="1.0" encoding="UTF-8"?>\n' \
+                         '<testsuites tests="0" failures="0" disabled="0" ' \
+                         'errors="0" timestamp="%s" time="0" ' \
+                         'name="AllTests">\n' \
+                         '  <testsuite name="%s" tests="0" failures="0" ' \
+                         'disabled="0" errors="0" time="0.0" ' \
+                         'unavailable="1" message="%s">\n' \
+                         '  </testsuite>\n' \
+                         '</testsuites>\n'
+_TESTS_DIR_KEY = "%stests%s" % (os.sep, os.sep)
+_CPP_TEST_COMMAND_TEMPLATE = "cd %s; chmod +x *; ./%s %s"
+_CPP_TEST_RERUN_COMMAND_TEMPLATE = "cd %s; ./%s %s"
+_JUNIT_TEST_COMMAND_TEMPLATE = \
+    "aa start -p %s -n ohos.testkit.runner.EntryAbility " \
+    "-s unittest %s -s rawLog true %s %s"
+_JUNIT_TEST_RERUN_COMMAND_TEMPLATE = \
+    "aa start -p %s -n ohos.testkit.runner.EntryAbility " \
+    "-s unittest %s -s rawLog true %s"
+_DEX_JUNIT_COMMAND_TEMPLATE = \
+    "export BOOTCLASSPATH=$BOOTCLASSPATH:{remote_path}/{module_name};" \
+    "cd {remote_path}; app_process -cp {remote_path}/{module_name} / " \
+    "ohos.testkit.runner.JUnitRunner {junit_para}{arg_list} " \
+    "--rawLog true --coverage false " \
+    "--classpathToScan {remote_path}/{module_name}"
+_DEX_TEST_COMMAND_TEMPLATE = \
+    "cd %s; rm -rf %s.xml; chmod +x *; " \
+    "export BOOTCLASSPATH=%s%s:$BOOTCLASSPATH; app_process %s%s %s"
+_DEX_TEST_COVERAGE_COMMAND_TEMPLATE = \
+    "cd %s; rm -rf %s.xml; chmod +x *; " \
+    "export BOOTCLASSPATH=%s%s:$BOOTCLASSPATH;" \
+    "export GCOV_PREFIX=%s; export GCOV_PREFIX_STRIP=%d; app_process %s%s %s"
+_APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+_FILE_MODE = FilePermission.mode_755
+_LOG_READ_SIZE = 1024 * 1024
+_LOG_POLL_INTERVAL = 1
+# dump tool which last found a test package on the device, serial as key
+_PACKAGE_DUMP_TOOLS = dict()
+# GCOV_PREFIX_STRIP by (source code root path, build variant)
+_GCOV_PREFIX_STRIPS = dict()
+# exclude rules by module name, (json file, mtime, test type) as key
+_EXCLUDE_RULES = dict()
+# parsed test config json and its (mtime, size), config file as key
+_JSON_CONFIGS = dict()
+_JSON_CONFIGS_LOCK = threading.Lock()
 
 
 @dataclass
@@ -91,89 +151,58 @@ class ZunitConst(object):
 
 
 def get_level_para_string(level_string):
-    level_list = list(set(level_string.split(",")))
-    level_para_string = ""
-    for item in level_list:
-        if not item.isdigit():
-            continue
-        item = item.strip(" ")
-        level_para_string = "%sLevel%s," % (level_para_string, item)
-    level_para_string = level_para_string.strip(",")
-    return level_para_string
+    levels = dict.fromkeys(item.strip() for item in level_string.split(","))
+    return ",".join("Level%s" % level for level in levels if level.isdigit())
 
 
 def get_execute_java_test_files(suite_file):
-    java_test_file = ""
+    java_test_files = []
     test_info_file = "%s.info" % suite_file[:suite_file.rfind(".")]
     if not os.path.exists(test_info_file):
-        return java_test_file
+        return ""
     try:
-        test_info_file_open = os.open(test_info_file, os.O_RDWR,
-                                      stat.S_IWUSR | stat.S_IRUSR)
-        with os.fdopen(test_info_file_open, "r") as file_desc:
-            lines = file_desc.readlines()
-            for line in lines:
-                class_name, _ = line.split(',', 1)
+        with open(test_info_file, "r") as file_desc:
+            for line in file_desc:
+                class_name, sep, _ = line.partition(',')
+                if not sep:
+                    continue
                 class_name = class_name.strip()
                 if not class_name.endswith("Test"):
                     continue
-                java_test_file = "%s%s," % (java_test_file, class_name)
+                java_test_files.append(class_name)
     except(IOError, ValueError) as err_msg:
         LOG.exception("Error to read info file: ", err_msg, exc_info=False)
-    if java_test_file != "":
-        java_test_file = java_test_file[:-1]
-    return java_test_file
+    return ",".join(java_test_files)
 
 
 def get_java_test_para(testcase, testlevel):
-    exec_class = "*"
-    exec_method = "*"
-    exec_level = ""
-
-    if "" != testcase and "" == testlevel:
-        pos = testcase.rfind(".")
-        if pos != -1:
-            exec_class = testcase[0:pos]
-            exec_method = testcase[pos + 1:]
-            exec_level = ""
-        else:
-            exec_class = "*"
-            exec_method = testcase
-            exec_level = ""
-    elif "" == testcase and "" != testlevel:
-        exec_class = "*"
-        exec_method = "*"
-        exec_level = get_level_para_string(testlevel)
-
-    return exec_class, exec_method, exec_level
+    if testcase and not testlevel:
+        exec_class, sep, exec_method = testcase.rpartition(".")
+        if sep:
+            return exec_class, exec_method, ""
+        return "*", testcase, ""
+    if not testcase and testlevel:
+        return "*", "*", get_level_para_string(testlevel)
+    return "*", "*", ""
 
 
 def get_xml_output(config, json_config):
     xml_output = config.testargs.get("xml-output")
-    if not xml_output:
-        if get_config_value('xml-output', json_config.get_driver(), False):
-            xml_output = get_config_value('xml-output',
-                                          json_config.get_driver(), False)
-        else:
-            xml_output = "false"
-    else:
+    if xml_output:
         xml_output = xml_output[0]
-    xml_output = str(xml_output).lower()
-    return xml_output
+    else:
+        xml_output = get_config_value('xml-output', json_config.get_driver(),
+                                      False) or "false"
+    return str(xml_output).lower()
 
 
 def get_result_savepath(testsuit_path, result_rootpath):
-    findkey = "%stests%s" % (os.sep, os.sep)
     filedir, _ = os.path.split(testsuit_path)
-    pos = filedir.find(findkey)
-    if -1 != pos:
-        subpath = filedir[pos + len(findkey):]
-        pos1 = subpath.find(os.sep)
-        if -1 != pos1:
-            subpath = subpath[pos1 + len(os.sep):]
-            result_path = os.path.join(result_rootpath, "result", subpath)
-        else:
-            result_path = os.path.join(result_rootpath, "result")
+    _, _, subpath = filedir.partition(_TESTS_DIR_KEY)
+    # skip the test type directory following "tests"
+    _, sep, subpath = subpath.partition(os.sep)
+    if sep:
+        result_path = os.path.join(result_rootpath, "result", subpath)
     else:
         result_path = os.path.join(result_rootpath, "result")
 
@@ -184,33 +213,126 @@ def get_result_savepath(testsuit_path, result_rootpath):
     return result_path
 
 
+def _open_log_file(log_file):
+    # the pipe is only handed to the log catching subprocess as its stdout,
+    # so there is nothing for python to buffer, encode or flush
+    log_file_open = os.open(log_file, _APPEND_FLAGS, _FILE_MODE)
+    return os.fdopen(log_file_open, "ab", buffering=0)
+
+
+@contextmanager
+def _catch_device_log(device, log_file):
+    # the caller starts catching into the pipe, stopping is always done here
+    with _open_log_file(log_file) as file_pipe:
+        try:
+            yield file_pipe
+        finally:
+            device.stop_catch_device_log()
+
+
+def _advise_sequential_read(file_fd):
+    # logs are scanned front to back, let the kernel read ahead further
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(file_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError as _:
+            pass
+
+
+class _LogLineReader:
+    """
+    Reads a log file which is still being written in large chunks and
+    hands out complete lines only, the unfinished tail is kept until the
+    rest of it has been written.
+    """
+
+    def __init__(self, file_read_pipe):
+        self.file_read_pipe = file_read_pipe
+        self.unfinished_line = ""
+
+    def read_lines(self):
+        while True:
+            data = self.file_read_pipe.read(_LOG_READ_SIZE)
+            if not data:
+                return
+            lines = "".join((self.unfinished_line, data)).split("\n")
+            self.unfinished_line = lines.pop()
+            for line in lines:
+                yield "%s\n" % line
+
+
+def _get_positive_int_config(key, driver, default):
+    value = get_config_value(key, driver, False, default)
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        int_value = int(value)
+    except (TypeError, ValueError) as _:
+        int_value = 0
+    if int_value < 1:
+        LOG.warning("Invalid %s value '%s' in driver config, use %s instead",
+                    key, value, default)
+        return default
+    return int_value
+
+
+def _get_gcov_prefix_strip(source_code_rootpath, build_variant):
+    key = (source_code_rootpath, build_variant)
+    if key not in _GCOV_PREFIX_STRIPS:
+        build_variant_outpath = os.path.join(
+            source_code_rootpath, "out", build_variant)
+        _GCOV_PREFIX_STRIPS[key] = \
+            len(build_variant_outpath.split(os.sep)) - 1
+    return _GCOV_PREFIX_STRIPS[key]
+
+
+def _get_json_config(config_file):
+    try:
+        file_stat = os.stat(config_file)
+    except OSError as _:
+        # let JsonParser report the missing config file
+        return JsonParser(config_file)
+    file_stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+    # drivers of several devices may run the same module at the same time
+    with _JSON_CONFIGS_LOCK:
+        cached = _JSON_CONFIGS.get(config_file)
+        if not cached or cached[0] != file_stamp:
+            cached = (file_stamp, JsonParser(config_file))
+            _JSON_CONFIGS[config_file] = cached
+    return cached[1]
+
+
+def _load_exclude_rules(json_file, test_type):
+    key = (json_file, os.path.getmtime(json_file), test_type)
+    if key not in _EXCLUDE_RULES:
+        with open(json_file, "rb") as file_handler:
+            json_data = json_loads(file_handler.read())
+        exclude_rules = dict()
+        for exclude in json_data.get(test_type, []):
+            if not isinstance(exclude, dict):
+                continue
+            # the first rule of a module wins
+            for module_name, filter_list in exclude.items():
+                exclude_rules.setdefault(module_name, filter_list)
+        _EXCLUDE_RULES[key] = exclude_rules
+    return _EXCLUDE_RULES[key]
+
+
 # all testsuit common Unavailable test result xml
 def _create_empty_result_file(filepath, filename, error_message):
     error_message = str(error_message)
-    error_message = error_message.replace("\"", "&quot;")
-    error_message = error_message.replace("<", "&lt;")
-    error_message = error_message.replace(">", "&gt;")
-    error_message = error_message.replace("&", "&amp;")
+    if _XML_ESCAPE_PATTERN.search(error_message):
+        error_message = _XML_ESCAPE_PATTERN.sub(
+            lambda match: _XML_ESCAPES[match.group()], error_message)
     if filename.endswith(".hap"):
-        filename = filename.split(".")[0]
+        filename = filename.partition(".")[0]
     if not os.path.exists(filepath):
-        file_open = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                            FilePermission.mode_755)
+        file_open = os.open(filepath, _WRITE_FLAGS, _FILE_MODE)
         with os.fdopen(file_open, "w") as file_desc:
             time_stamp = time.strftime("%Y-%m-%d %H:%M:%S",
                                        time.localtime())
-            file_desc.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            file_desc.write('<testsuites tests="0" failures="0" '
-                            'disabled="0" errors="0" timestamp="%s" '
-                            'time="0" name="AllTests">\n' % time_stamp)
-            file_desc.write(
-                '  <testsuite name="%s" tests="0" failures="0" '
-                'disabled="0" errors="0" time="0.0" '
-                'unavailable="1" message="%s">\n' %
-                (filename, error_message))
-            file_desc.write('  </testsuite>\n')
-            file_desc.write('</testsuites>\n')
-            file_desc.flush()
+            file_desc.write(_EMPTY_RESULT_TEMPLATE % (
+                time_stamp, filename, error_message))
     return
 
 
@@ -245,7 +367,7 @@ class ResultManager(object):
                                               self.result_rootpath)
         if self.testsuite_path.endswith('.hap'):
             filepath = os.path.join(result_savepath, "%s.xml" % str(
-                self.testsuite_name).split(".")[0])
+                self.testsuite_name).partition(".")[0])
 
             remote_result_name = ""
             if self.device.is_file_exist(os.path.join(self.device_testpath,
@@ -274,33 +396,27 @@ class ResultManager(object):
                 LOG.error("%s not exists", remote_result_file)
         return filepath
 
-    def is_exist_target_in_device(self, path, target):
-        command = "ls -l %s | grep %s" % (path, target)
-
-        check_result = False
-        stdout_info = self.device.execute_shell_command(command)
-        if stdout_info != "" and stdout_info.find(target) != -1:
-            check_result = True
-        return check_result
-
     def obtain_coverage_data(self):
-        java_cov_path = os.path.abspath(
-            os.path.join(self.result_rootpath, "..", "coverage/data/exec"))
+        cov_data_path = os.path.normpath(
+            os.path.join(self.result_rootpath, "..", "coverage/data"))
+        if not os.path.isabs(cov_data_path):
+            cov_data_path = os.path.abspath(cov_data_path)
+        java_cov_path = os.path.join(cov_data_path, "exec")
         dst_target_name = "%s.exec" % self.testsuite_name
         src_target_name = "jacoco.exec"
-        if self.is_exist_target_in_device(self.device_testpath,
-                                          src_target_name):
+        if self.device.is_file_exist(
+                os.path.join(self.device_testpath, src_target_name)):
             if not os.path.exists(java_cov_path):
                 os.makedirs(java_cov_path)
             self.device.pull_file(
                 os.path.join(self.device_testpath, src_target_name),
                 os.path.join(java_cov_path, dst_target_name))
 
-        cxx_cov_path = os.path.abspath(
-            os.path.join(self.result_rootpath, "..", "coverage/data/cxx",
-                         self.testsuite_name))
+        cxx_cov_path = os.path.join(cov_data_path, "cxx",
+                                    self.testsuite_name)
         target_name = "obj"
-        if self.is_exist_target_in_device(self.device_testpath, target_name):
+        if self.device.is_directory(
+                os.path.join(self.device_testpath, target_name)):
             if not os.path.exists(cxx_cov_path):
                 os.makedirs(cxx_cov_path)
             src_file = os.path.join(self.device_testpath, target_name)
@@ -352,18 +468,12 @@ class CppTestDriver(IDriver):
                 get_module_name(),
                 "device_hilog")
 
-            device_log_open = os.open(device_log, os.O_WRONLY | os.O_CREAT |
-                                      os.O_APPEND, FilePermission.mode_755)
-            hilog_open = os.open(hilog, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                                 FilePermission.mode_755)
-            with os.fdopen(device_log_open, "a") as log_file_pipe, \
-                    os.fdopen(hilog_open, "a") as hilog_file_pipe:
+            with _open_log_file(device_log) as log_file_pipe, \
+                    _open_log_file(hilog) as hilog_file_pipe:
                 self.config.device.start_catch_device_log(log_file_pipe,
                                                           hilog_file_pipe)
                 self._run_cpp_test(config_file, listeners=request.listeners,
                                    request=request)
-                log_file_pipe.flush()
-                hilog_file_pipe.flush()
 
         except Exception as exception:
             self.error_message = exception
@@ -386,7 +496,7 @@ class CppTestDriver(IDriver):
                     "Error: Test cases don't exit %s." % config_file,
                     error_no="00102")
 
-            json_config = JsonParser(config_file)
+            json_config = _get_json_config(config_file)
             kits = get_kit_instances(json_config, self.config.resource_path,
                                      self.config.testcases_path)
 
@@ -414,13 +524,13 @@ class CppTestDriver(IDriver):
             if len(test_item) != 2:
                 continue
             self.runner.add_instrumentation_arg(
-                "gtest_filter", "%s.%s" % (test_item[0], test_item[1]))
+                "gtest_filter", ".".join(test_item))
             self.runner.run(listener)
 
     def _do_test_run(self, listener):
         test_to_run = self._collect_test_to_run()
-        LOG.info("Collected test count is: %s" % (len(test_to_run)
-                 if test_to_run else 0))
+        LOG.info("Collected test count is: %s",
+                 len(test_to_run) if test_to_run else 0)
         if not test_to_run:
             self.runner.run(listener)
         else:
@@ -443,39 +553,40 @@ class CppTestDriver(IDriver):
         return test_run
 
     def _run_with_rerun(self, listener, expected_tests):
-        LOG.debug("Ready to run with rerun, expect run: %s"
-                  % len(expected_tests))
+        LOG.debug("Ready to run with rerun, expect run: %s",
+                  len(expected_tests))
         test_run = self._run_tests(listener)
-        LOG.debug("Run with rerun, has run: %s" % len(test_run)
-                  if test_run else 0)
+        LOG.debug("Run with rerun, has run: %s",
+                  len(test_run) if test_run else 0)
         if len(test_run) < len(expected_tests):
             expected_tests = TestDescription.remove_test(expected_tests,
                                                          test_run)
             if not expected_tests:
                 LOG.debug("No tests to re-run, all tests executed at least "
                           "once.")
+                return
             if self.rerun_all:
                 self._rerun_all(expected_tests, listener)
             else:
                 self._rerun_serially(expected_tests, listener)
 
     def _rerun_all(self, expected_tests, listener):
-        tests = []
-        for test in expected_tests:
-            tests.append("%s.%s" % (test.class_name, test.test_name))
-        self.runner.add_instrumentation_arg("gtest_filter", ":".join(tests))
-        LOG.debug("Ready to rerun file, expect run: %s" % len(expected_tests))
+        tests = ":".join("%s.%s" % (test.class_name, test.test_name)
+                         for test in expected_tests)
+        self.runner.add_instrumentation_arg("gtest_filter", tests)
+        LOG.debug("Ready to rerun file, expect run: %s", len(expected_tests))
         test_run = self._run_tests(listener)
-        LOG.debug("Rerun file, has run: %s" % len(test_run))
+        LOG.debug("Rerun file, has run: %s", len(test_run))
         if len(test_run) < len(expected_tests):
             expected_tests = TestDescription.remove_test(expected_tests,
                                                          test_run)
             if not expected_tests:
                 LOG.debug("Rerun textFile success")
+                return
             self._rerun_serially(expected_tests, listener)
 
     def _rerun_serially(self, expected_tests, listener):
-        LOG.debug("Rerun serially, expected run: %s" % len(expected_tests))
+        LOG.debug("Rerun serially, expected run: %s", len(expected_tests))
         for test in expected_tests:
             self.runner.add_instrumentation_arg(
                 "gtest_filter", "%s.%s" % (test.class_name, test.test_name))
@@ -483,24 +594,24 @@ class CppTestDriver(IDriver):
             self.runner.remove_instrumentation_arg("gtest_filter")
 
     def _get_driver_config(self, json_config):
+        driver = json_config.get_driver()
         target_test_path = get_config_value('native-test-device-path',
-                                            json_config.get_driver(), False)
+                                            driver, False)
         if target_test_path:
             self.config.target_test_path = target_test_path
         else:
             self.config.target_test_path = DEFAULT_TEST_PATH
 
         self.config.module_name = get_config_value(
-            'module-name', json_config.get_driver(), False)
+            'module-name', driver, False)
 
-        timeout_config = get_config_value('native-test-timeout',
-                                          json_config.get_driver(), False)
+        timeout_config = get_config_value('native-test-timeout', driver, False)
         if timeout_config:
             self.config.timeout = int(timeout_config)
         else:
             self.config.timeout = TIME_OUT
 
-        rerun = get_config_value('rerun', json_config.get_driver(), False)
+        rerun = get_config_value('rerun', driver, False)
         if isinstance(rerun, bool):
             self.rerun = rerun
         elif str(rerun).lower() == "false":
@@ -518,33 +629,26 @@ class RemoteCppTestRunner:
         self.suite_name = None
         self.config = config
         self.rerun_attempt = FAILED_RUN_TEST_ATTEMPTS
+        self.is_executable = False
+        # parser plugins don't change while running, look them up only once
+        self.parser_classes = [parser.__class__ for parser in get_plugin(
+            Plugin.PARSER, CommonParserType.cpptest)[:1]]
+        self.list_parser_classes = [parser.__class__ for parser in get_plugin(
+            Plugin.PARSER, CommonParserType.cpptest_list)[:1]]
 
     def dry_run(self):
-        parsers = get_plugin(Plugin.PARSER, CommonParserType.cpptest_list)
-        if parsers:
-            parsers = parsers[:1]
         parser_instances = []
-        for parser in parsers:
-            parser_instance = parser.__class__()
+        for parser_class in self.list_parser_classes:
+            parser_instance = parser_class()
             parser_instances.append(parser_instance)
         handler = ShellHandler(parser_instances)
 
-        command = "cd %s; chmod +x *; ./%s %s" \
-                  % (self.config.target_test_path, self.config.module_name,
-                     self.get_args_command())
-
-        self.config.device.execute_shell_command(
-            command, timeout=self.config.timeout, receiver=handler, retry=0)
+        self._execute_test_command(handler)
         return parser_instances[0].tests
 
     def run(self, listener):
         handler = self._get_shell_handler(listener)
-        command = "cd %s; chmod +x *; ./%s %s" \
-                  % (self.config.target_test_path, self.config.module_name,
-                     self.get_args_command())
-
-        self.config.device.execute_shell_command(
-            command, timeout=self.config.timeout, receiver=handler, retry=0)
+        self._execute_test_command(handler)
 
     def rerun(self, listener, test):
         if self.rerun_attempt:
@@ -553,15 +657,7 @@ class RemoteCppTestRunner:
             listener_copy.append(test_tracker)
             handler = self._get_shell_handler(listener_copy)
             try:
-                command = "cd %s; chmod +x *; ./%s %s" \
-                          % (self.config.target_test_path,
-                             self.config.module_name,
-                             self.get_args_command())
-
-                self.config.device.execute_shell_command(
-                    command, timeout=self.config.timeout, receiver=handler,
-                    retry=0)
-
+                self._execute_test_command(handler)
             except ShellCommandUnresponsiveException as _:
                 LOG.debug("Exception: ShellCommandUnresponsiveException")
             finally:
@@ -580,33 +676,43 @@ class RemoteCppTestRunner:
         self.arg_list[name] = value
 
     def remove_instrumentation_arg(self, name):
-        if not name:
-            return
-        if name in self.arg_list:
-            del self.arg_list[name]
+        if name:
+            self.arg_list.pop(name, None)
 
     def get_args_command(self):
-        args_commands = ""
+        if not self.arg_list:
+            return ""
+        args_commands = []
         for key, value in self.arg_list.items():
             if key == "gtest_list_tests":
-                args_commands = "%s --%s" % (args_commands, key)
+                args_commands.append(" --%s" % key)
             else:
-                args_commands = "%s --%s=%s" % (args_commands, key, value)
-        return args_commands
+                args_commands.append(" --%s=%s" % (key, value))
+        return "".join(args_commands)
 
     def _get_shell_handler(self, listener):
-        parsers = get_plugin(Plugin.PARSER, CommonParserType.cpptest)
-        if parsers:
-            parsers = parsers[:1]
         parser_instances = []
-        for parser in parsers:
-            parser_instance = parser.__class__()
+        for parser_class in self.parser_classes:
+            parser_instance = parser_class()
             parser_instance.suite_name = self.suite_name
             parser_instance.listeners = listener
             parser_instances.append(parser_instance)
         handler = ShellHandler(parser_instances)
         return handler
 
+    def _execute_test_command(self, handler):
+        # test files only need to be made executable by the first command
+        if self.is_executable:
+            template = _CPP_TEST_RERUN_COMMAND_TEMPLATE
+        else:
+            template = _CPP_TEST_COMMAND_TEMPLATE
+        command = template % (self.config.target_test_path,
+                              self.config.module_name,
+                              self.get_args_command())
+        self.config.device.execute_shell_command(
+            command, timeout=self.config.timeout, receiver=handler, retry=0)
+        self.is_executable = True
+
 
 @Plugin(type=Plugin.DRIVER, id=DeviceTestType.junit_test)
 class JUnitTestDriver(IDriver):
@@ -622,7 +728,9 @@ class JUnitTestDriver(IDriver):
         self.rerun = True
         self.runner = None
         self.rerun_using_test_file = True
+        self.rerun_batch_size = RERUN_BATCH_SIZE
         self.temp_file_list = []
+        self.device_temp_file_list = []
         self.is_no_test = False
 
     def __check_environment__(self, device_options):
@@ -667,21 +775,16 @@ class JUnitTestDriver(IDriver):
                         get_module_name(),
                         "device_hilog", device_name)
 
-                    device_log_open = os.open(device_log, os.O_WRONLY |
-                                              os.O_CREAT | os.O_APPEND,
-                                              FilePermission.mode_755)
-                    hilog_open = os.open(hilog, os.O_WRONLY | os.O_CREAT |
-                                         os.O_APPEND, FilePermission.mode_755)
-                    device_log_pipe = os.fdopen(device_log_open, "a")
-                    hilog_pipe = os.fdopen(hilog_open, "a")
+                    device_log_pipe = _open_log_file(device_log)
+                    device_log_pipes.append(device_log_pipe)
+                    hilog_pipe = _open_log_file(hilog)
+                    device_log_pipes.append(hilog_pipe)
                     device.start_catch_device_log(device_log_pipe, hilog_pipe)
-                    device_log_pipes.extend([device_log_pipe, hilog_pipe])
 
                 self._run_junit(config_file, listeners=request.listeners,
                                 request=request)
             finally:
                 for device_log_pipe in device_log_pipes:
-                    device_log_pipe.flush()
                     device_log_pipe.close()
                 for device in self.config.devices:
                     device.stop_catch_device_log()
@@ -714,7 +817,7 @@ class JUnitTestDriver(IDriver):
                     if device.usb_type == DeviceConnectorType.hdc \
                     else "remount"
                 device.connector_command(cmd)
-            json_config = JsonParser(config_file)
+            json_config = _get_json_config(config_file)
             self.kits = get_kit_instances(json_config,
                                           self.config.resource_path,
                                           self.config.testcases_path)
@@ -746,20 +849,32 @@ class JUnitTestDriver(IDriver):
                     self.runner.junit_para.find("testFile") != -1
                     or self.runner.junit_para.find("notTestFile") != -1):
                 self._junit_clear()
+            else:
+                self._clear_device_temp_files()
 
     def _junit_clear(self):
-        self.config.device.execute_shell_command(
+        self._clear_device_temp_files(
             "rm -r /%s/%s/%s" % ("data", "local", "ajur"))
         for temp_file in self.temp_file_list:
             if os.path.exists(temp_file):
                 os.remove(temp_file)
         self.temp_file_list.clear()
 
+    def _clear_device_temp_files(self, *commands):
+        commands = list(commands)
+        if self.device_temp_file_list:
+            commands.append(
+                "rm -f %s" % " ".join(self.device_temp_file_list))
+            self.device_temp_file_list.clear()
+        # one shell round trip for all the cleanups
+        if commands:
+            self.config.device.execute_shell_command("; ".join(commands))
+
     def _get_driver_config(self, json_config):
-        package = get_config_value('package', json_config.get_driver(), False)
+        driver = json_config.get_driver()
+        package = get_config_value('package', driver, False)
         runner = "ohos.testkit.runner.Runner"
-        include_tests = get_config_value("include-tests",
-                                         json_config.get_driver(), True, [])
+        include_tests = get_config_value("include-tests", driver, True, [])
         if not package:
             raise ParamError("Can't find package in config file.")
         self.config.package = package
@@ -768,14 +883,16 @@ class JUnitTestDriver(IDriver):
 
         self.config.xml_output = get_xml_output(self.config, json_config)
 
-        timeout_config = get_config_value('shell-timeout',
-                                          json_config.get_driver(), False)
+        timeout_config = get_config_value('shell-timeout', driver, False)
         if timeout_config:
             self.config.timeout = int(timeout_config)
         else:
             self.config.timeout = TIME_OUT
 
-        nohup = get_config_value('nohup', json_config.get_driver(), False)
+        self.rerun_batch_size = _get_positive_int_config(
+            'rerun-batch-size', driver, RERUN_BATCH_SIZE)
+
+        nohup = get_config_value('nohup', driver, False)
         if nohup and (nohup == "true" or nohup == "True"):
             self.config.nohup = True
         else:
@@ -802,29 +919,43 @@ class JUnitTestDriver(IDriver):
             LOG.error("%s is not supported test" % self.config.package)
             raise HapNotSupportTest("%s is not supported test" %
                                     self.config.package)
+        if not self.rerun or self.config.xml_output != "false" or \
+                self.config.nohup:
+            self.is_no_test = True
+            self.runner.run(listener)
+            return
+        test_tracker = CollectingTestListener()
+        listener_copy = listener.copy()
+        listener_copy.append(test_tracker)
+        self.runner.run(listener_copy)
+        test_run = test_tracker.get_current_run_results()
+        # collect the tests only when the run did not report all of them
+        if 0 < test_tracker.get_expected_test_num() <= len(test_run):
+            LOG.debug("All %s tests run, no need to collect", len(test_run))
+            return
         test_to_run = self._collect_test_to_run()
-        LOG.info("Collected test count is: %s" % (len(test_to_run)
-                 if test_to_run else 0))
+        LOG.info("Collected test count is: %s",
+                 len(test_to_run) if test_to_run else 0)
         if not test_to_run:
             self.is_no_test = True
-            self.runner.run(listener)
         else:
-            self._run_with_rerun(listener, test_to_run)
+            self._rerun_missing_tests(listener, test_to_run, test_run)
 
     def _check_package(self):
-        command = '''systemdumper -s 401 -a "-bundle %s"''' % \
-                  self.config.package
-        output = self.config.device.execute_shell_command(command)
-        LOG.debug("Systemdumper output: %s" % output)
-        if output and "ohos.testkit.runner.EntryAbility" in output:
-            return True
-        else:
-            LOG.info("Try hidumper command to check package")
-            command = '''hidumper -s 401 -a "-bundle %s"''' % \
-                      self.config.package
+        serial = self.config.device.__get_serial__()
+        dump_tools = ["systemdumper", "hidumper"]
+        # try the tool which found a test package on this device before
+        if _PACKAGE_DUMP_TOOLS.get(serial) == "hidumper":
+            dump_tools.reverse()
+        for index, dump_tool in enumerate(dump_tools):
+            if index:
+                LOG.info("Try %s command to check package", dump_tool)
+            command = '''%s -s 401 -a "-bundle %s"''' % (
+                dump_tool, self.config.package)
             output = self.config.device.execute_shell_command(command)
-            LOG.debug("Hidumper output: %s" % output)
+            LOG.debug("%s output: %s", dump_tool, output)
             if output and "ohos.testkit.runner.EntryAbility" in output:
+                _PACKAGE_DUMP_TOOLS[serial] = dump_tool
                 return True
         return False
 
@@ -836,63 +967,75 @@ class JUnitTestDriver(IDriver):
         test_run = test_tracker.get_current_run_results()
         return test_run
 
-    def _run_with_rerun(self, listener, expected_tests):
-        LOG.debug("Ready to run with rerun, expect run: %s"
-                  % len(expected_tests))
-        test_run = self._run_tests(listener)
-        LOG.debug("Run with rerun, has run: %s" % len(test_run)
-                  if test_run else 0)
+    def _rerun_missing_tests(self, listener, expected_tests, test_run):
+        LOG.debug("Run with rerun, expect run: %s, has run: %s",
+                  len(expected_tests), len(test_run))
         if len(test_run) < len(expected_tests):
             expected_tests = TestDescription.remove_test(
                 expected_tests, test_run)
             if not expected_tests:
                 LOG.debug("No tests to re-run, all tests executed at least "
                           "once.")
+                return
             if self.rerun_using_test_file:
                 self._rerun_file(expected_tests, listener)
             else:
                 self._rerun_serially(expected_tests, listener)
 
-    def _make_test_file(self, expected_tests, test_file_path):
+    def _make_test_file(self, expected_tests):
         file_name = 'xdevice_testFile_%s.txt' % self.runner.suite_name
-        file_path = os.path.join(test_file_path, file_name)
+        file_path_open, file_path = tempfile.mkstemp(
+            prefix="test_file_", suffix=".txt", dir=self.config.report_path)
         try:
-            file_path_open = os.open(file_path, os.O_WRONLY | os.O_CREAT |
-                                     os.O_APPEND, FilePermission.mode_755)
-            with os.fdopen(file_path_open, "a") as file_desc:
-                for test in expected_tests:
-                    file_desc.write("%s#%s" % (test.class_name,
-                                               test.test_name))
-                    file_desc.write("\n")
-                    file_desc.flush()
+            with os.fdopen(file_path_open, "w") as file_desc:
+                file_desc.write("".join(
+                    "%s#%s\n" % (test.class_name, test.test_name)
+                    for test in expected_tests))
         except(IOError, ValueError) as err_msg:
             LOG.exception("Error for make long command file: ", err_msg,
                           exc_info=False, error_no="03200")
         return file_name, file_path
 
-    def _rerun_file(self, expected_tests, listener):
-        test_file_path = tempfile.mkdtemp(prefix="test_file_",
-                                          dir=self.config.report_path)
-        file_name, file_path = self._make_test_file(
-            expected_tests, test_file_path)
-        self.config.device.push_file(file_path, ON_DEVICE_TEST_DIR_LOCATION)
+    def _run_test_file(self, expected_tests, listener):
+        file_name, file_path = self._make_test_file(expected_tests)
         file_path_on_device = ''.join((ON_DEVICE_TEST_DIR_LOCATION, file_name))
+        try:
+            self.config.device.push_file(file_path, file_path_on_device)
+        finally:
+            os.remove(file_path)
         self.runner.add_instrumentation_arg("testFile", file_path_on_device)
         self.runner.junit_para = reset_junit_para(self.runner.junit_para, "-s")
-        LOG.debug("Ready to rerun file, expect run: %s" % len(expected_tests))
         test_run = self._run_tests(listener)
-        LOG.debug("Rerun file, has run: %s" % len(test_run))
-        self.config.device.execute_shell_command("rm %s" % file_path_on_device)
+        if file_path_on_device not in self.device_temp_file_list:
+            self.device_temp_file_list.append(file_path_on_device)
+        return test_run
+
+    def _rerun_file(self, expected_tests, listener):
+        LOG.debug("Ready to rerun file, expect run: %s", len(expected_tests))
+        test_run = self._run_test_file(expected_tests, listener)
+        LOG.debug("Rerun file, has run: %s", len(test_run))
         if len(test_run) < len(expected_tests):
             expected_tests = TestDescription.remove_test(expected_tests,
                                                          test_run)
             if not expected_tests:
                 LOG.debug("Rerun textFile success")
+                return
             self._rerun_serially(expected_tests, listener)
-        shutil.rmtree(test_file_path)
 
     def _rerun_serially(self, expected_tests, listener):
-        LOG.debug("Rerun serially, expected run: %s" % len(expected_tests))
+        LOG.debug("Rerun serially, expected run: %s", len(expected_tests))
+        if self.rerun_using_test_file and \
+                len(expected_tests) > self.rerun_batch_size:
+            # one launch per batch, only tests a batch missed run alone
+            missed_tests = []
+            for index in range(0, len(expected_tests), self.rerun_batch_size):
+                batch_tests = expected_tests[
+                    index:index + self.rerun_batch_size]
+                test_run = self._run_test_file(batch_tests, listener)
+                missed_tests.extend(
+                    TestDescription.remove_test(batch_tests, test_run))
+            LOG.debug("Rerun in batches, missed: %s", len(missed_tests))
+            expected_tests = missed_tests
         self.runner.remove_instrumentation_arg("testFile")
         for test in expected_tests:
             self.runner.class_name = test.class_name
@@ -900,13 +1043,10 @@ class JUnitTestDriver(IDriver):
             self.runner.rerun(listener, test)
 
     def _collect_test_to_run(self):
-        if self.rerun and self.config.xml_output == "false" and \
-                not self.config.nohup:
-            self.runner.set_test_collection(True)
-            tests = self._collect_test_and_retry()
-            self.runner.set_test_collection(False)
-            return tests
-        return None
+        self.runner.set_test_collection(True)
+        tests = self._collect_test_and_retry()
+        self.runner.set_test_collection(False)
+        return tests
 
     def _collect_test_and_retry(self):
         collector = CollectingTestListener()
@@ -945,17 +1085,14 @@ class JUnitTestDriver(IDriver):
         else:
             test_list = [ele.strip() for ele in self.config.include_tests]
         if test_list:
-            import datetime
-            prefix = datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')
+            prefix = "%x" % time.time_ns()
 
             save_file = \
                 os.path.join(self.config.report_path, "temp_%s.txt" % prefix)
-            save_file_open = os.open(save_file, os.O_WRONLY
-                                     | os.O_CREAT, FilePermission.mode_755)
+            save_file_open = os.open(save_file, _WRITE_FLAGS, _FILE_MODE)
             with os.fdopen(save_file_open, "w") as save_handler:
-                for test in test_list:
-                    save_handler.write("{}\n".format(test.strip()))
-                save_handler.flush()
+                save_handler.write("".join(
+                    "{}\n".format(test.strip()) for test in test_list))
             self.temp_file_list.append(save_file)
             include_tests_key = "test-file-include-filter"
             self.config.testargs.update(
@@ -968,34 +1105,30 @@ class JUnitTestDriver(IDriver):
             raise ParamError(msg)
 
     def _slice_include_tests(self):
-        test_filter = dict()
+        test_filter = {"test_in": set(), "class_in": set()}
         for include_test in self.config.include_tests:
             include_test = include_test.strip()
             if include_test:
                 # element like 'class#method'
                 if "#" in include_test:
-                    test_list = test_filter.get("test_in", [])
-                    test_list.append(include_test)
-                    test_filter.update({"test_in": test_list})
+                    test_filter["test_in"].add(include_test)
                 # element like 'class'
                 else:
-                    class_list = test_filter.get("class_in", [])
-                    class_list.append(include_test)
-                    test_filter.update({"class_in": class_list})
+                    test_filter["class_in"].add(include_test)
             else:
                 LOG.warning("There is empty element in include-tests")
-        if len([ele for test in test_filter.values() for ele in test]) > 0:
+        if test_filter["test_in"] or test_filter["class_in"]:
             return test_filter
 
     @classmethod
     def _filter_valid_test(cls, element, test_filter):
         element = element.strip()
         # if element in the list which element like 'class#method'
-        if element in test_filter.get("test_in", []):
+        if element in test_filter["test_in"]:
             return element
         # if element is the list which element like 'class'
-        element_items = element.split("#")
-        if element_items[0].strip() in test_filter.get("class_in", []):
+        element_items = element.split("#", 1)
+        if element_items[0].strip() in test_filter["class_in"]:
             return element
         raise ParamError("{} not match 'include-tests'!".format(element))
 
@@ -1017,30 +1150,22 @@ class JUnitTestDriver(IDriver):
                     LOG.warning(
                         " [%s] is not a valid file" % json_file_list[0])
                     return
-                file_open = os.open(json_file_list[0], os.O_RDONLY,
-                                    stat.S_IWUSR | stat.S_IRUSR)
-                with os.fdopen(file_open, "r") as file_handler:
-                    json_data = json.load(file_handler)
-                exclude_list = json_data.get(
-                    DeviceTestType.junit_test, [])
-
-                from xdevice import Variables
+                exclude_rules = _load_exclude_rules(
+                    json_file_list[0], DeviceTestType.junit_test)
+
+                module_name = request.get_module_name()
                 exclude_file = os.path.join(
-                    self.config.report_path, '{}_exclude.txt'.format(
-                        request.get_module_name()))
-                for exclude in exclude_list:
-                    if request.get_module_name() not in exclude:
-                        continue
+                    self.config.report_path,
+                    '{}_exclude.txt'.format(module_name))
+                if module_name in exclude_rules:
                     exclude_file_open = os.open(
-                        exclude_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                        FilePermission.mode_755)
-                    with os.fdopen(exclude_file_open, "a") as file_handler:
-                        filter_list = exclude.get(request.get_module_name())
+                        exclude_file, _WRITE_FLAGS, _FILE_MODE)
+                    with os.fdopen(exclude_file_open, "w") as file_handler:
+                        filter_list = exclude_rules[module_name]
                         if isinstance(filter_list, list):
-                            file_handler.writelines(
-                                ["%s\n" % item.strip() for item in filter_list
-                                 if item.strip()])
-                        break
+                            file_handler.write("".join(
+                                "%s\n" % item for item in map(
+                                    str.strip, filter_list) if item))
                 if os.path.exists(exclude_file):
                     self.temp_file_list.append(exclude_file)
                     self.config.testargs['test-file-exclude-filter'] \
@@ -1062,6 +1187,12 @@ class RemoteTestRunner:
         self.junit_para = None
         self.config = config
         self.rerun_attempt = FAILED_RUN_TEST_ATTEMPTS
+        # parser plugins don't change while running, look them up only once
+        self.parser_classes = [parser.__class__ for parser in get_plugin(
+            Plugin.PARSER, CommonParserType.junit)[:1]]
+        self.rerun_listener_source = None
+        self.rerun_listener = None
+        self.rerun_tracker = None
 
     def __check_environment__(self, device_options):
         pass
@@ -1069,11 +1200,9 @@ class RemoteTestRunner:
     def run(self, listener):
         handler = self._get_shell_handler(listener)
         # execute test case
-        command = "aa start -p %s " \
-                  "-n ohos.testkit.runner.EntryAbility" \
-                  " -s unittest %s -s rawLog true %s %s" \
-                  % (self.config.package, self.config.runner, self.junit_para,
-                     self.get_args_command())
+        command = _JUNIT_TEST_COMMAND_TEMPLATE % (
+            self.config.package, self.config.runner, self.junit_para,
+            self.get_args_command())
 
         try:
             if self.config.nohup:
@@ -1102,16 +1231,12 @@ class RemoteTestRunner:
 
     def rerun(self, listener, test):
         if self.rerun_attempt:
-            listener_copy = listener.copy()
-            test_tracker = CollectingTestListener()
-            listener_copy.append(test_tracker)
+            listener_copy, test_tracker = self._get_rerun_listener(listener)
             handler = self._get_shell_handler(listener_copy)
             try:
-                command = "aa start -p %s " \
-                          "-n ohos.testkit.runner.EntryAbility" \
-                          " -s unittest %s -s rawLog true %s" \
-                          % (self.config.package, self.config.runner,
-                             self.get_args_command())
+                command = _JUNIT_TEST_RERUN_COMMAND_TEMPLATE % (
+                    self.config.package, self.config.runner,
+                    self.get_args_command())
 
                 self.config.device.execute_shell_command(
                     command, timeout=self.config.timeout, receiver=handler,
@@ -1141,30 +1266,35 @@ class RemoteTestRunner:
         self.arg_list[name] = value
 
     def remove_instrumentation_arg(self, name):
-        if not name:
-            return
-        if name in self.arg_list:
-            del self.arg_list[name]
+        if name:
+            self.arg_list.pop(name, None)
 
     def get_args_command(self):
-        args_commands = ""
-        for key, value in self.arg_list.items():
-            args_commands = "%s -s %s %s" % (args_commands, key, value)
+        args_commands = [" -s %s %s" % (key, value)
+                         for key, value in self.arg_list.items()]
         if self.class_name and self.test_name:
-            args_commands = "%s -s class %s#%s" % (args_commands,
-                                                   self.class_name,
-                                                   self.test_name)
+            args_commands.append(" -s class %s#%s" % (self.class_name,
+                                                      self.test_name))
         elif self.class_name:
-            args_commands = "%s -s class %s" % (args_commands, self.class_name)
-        return args_commands
+            args_commands.append(" -s class %s" % self.class_name)
+        return "".join(args_commands)
+
+    def _get_rerun_listener(self, listener):
+        # tests are rerun one by one with the same listeners, so the copy
+        # with a tracker appended is built once and the tracker is reset
+        if self.rerun_listener_source is not listener:
+            self.rerun_tracker = CollectingTestListener()
+            self.rerun_listener = listener.copy()
+            self.rerun_listener.append(self.rerun_tracker)
+            self.rerun_listener_source = listener
+        else:
+            self.rerun_tracker.clear_current_run_results()
+        return self.rerun_listener, self.rerun_tracker
 
     def _get_shell_handler(self, listener):
-        parsers = get_plugin(Plugin.PARSER, CommonParserType.junit)
-        if parsers:
-            parsers = parsers[:1]
         parser_instances = []
-        for parser in parsers:
-            parser_instance = parser.__class__()
+        for parser_class in self.parser_classes:
+            parser_instance = parser_class()
             parser_instance.suite_name = self.suite_name
             parser_instance.listeners = listener
             parser_instances.append(parser_instance)
@@ -1186,6 +1316,7 @@ class DexJunitDriver(IDriver):
         self.runner = None
         self.rerun_using_test_file = True
         self.temp_file_list = []
+        self.device_temp_file_list = []
 
     def __check_environment__(self, device_options):
         pass
@@ -1205,28 +1336,19 @@ class DexJunitDriver(IDriver):
                                        '.'.join((request.get_module_name(),
                                                  "xml")))
 
+            serial = self.config.device.__get_serial__()
             device_log = get_device_log_file(
-                request.config.report_path,
-                request.config.device.__get_serial__(),
-                "device_log")
+                request.config.report_path, serial, "device_log")
 
             hilog = get_device_log_file(
-                request.config.report_path,
-                request.config.device.__get_serial__(),
-                "device_hilog")
+                request.config.report_path, serial, "device_hilog")
 
-            device_log_open = os.open(device_log, os.O_WRONLY | os.O_CREAT |
-                                      os.O_APPEND, FilePermission.mode_755)
-            hilog_open = os.open(hilog, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                                 FilePermission.mode_755)
-            with os.fdopen(device_log_open, "a") as log_file_pipe, \
-                    os.fdopen(hilog_open, "a") as hilog_file_pipe:
+            with _open_log_file(device_log) as log_file_pipe, \
+                    _open_log_file(hilog) as hilog_file_pipe:
                 self.config.device.start_catch_device_log(log_file_pipe,
                                                           hilog_file_pipe)
                 self._run_dex_junit(config_file, listeners=request.listeners,
                                     request=request)
-                log_file_pipe.flush()
-                hilog_file_pipe.flush()
 
         except Exception as exception:
             self.error_message = exception
@@ -1248,7 +1370,7 @@ class DexJunitDriver(IDriver):
                     "Error: Test cases don't exit %s." % config_file,
                     error_no="00102")
 
-            json_config = JsonParser(config_file)
+            json_config = _get_json_config(config_file)
             kits = get_kit_instances(json_config, self.config.resource_path,
                                      self.config.testcases_path)
 
@@ -1275,6 +1397,8 @@ class DexJunitDriver(IDriver):
                     self.runner.junit_para.find("testFile") != -1
                     or self.runner.junit_para.find("notTestFile") != -1):
                 self._junit_clear()
+            else:
+                self._clear_device_temp_files()
 
     def _do_test_retry(self, listener, testargs):
         for test in testargs.get("test"):
@@ -1287,8 +1411,8 @@ class DexJunitDriver(IDriver):
 
     def _do_test_run(self, listener):
         test_to_run = self._collect_test_to_run()
-        LOG.info("Collected test count is: %s" % (len(test_to_run)
-                 if test_to_run else 0))
+        LOG.info("Collected test count is: %s",
+                 len(test_to_run) if test_to_run else 0)
         if not test_to_run:
             self.runner.run(listener)
         else:
@@ -1307,62 +1431,61 @@ class DexJunitDriver(IDriver):
         return test_run
 
     def _run_with_rerun(self, listener, expected_tests):
-        LOG.debug("Ready to run with rerun, expect run: %s"
-                  % len(expected_tests))
+        LOG.debug("Ready to run with rerun, expect run: %s",
+                  len(expected_tests))
         test_run = self._run_tests(listener)
-        LOG.debug("Run with rerun, has run: %s" % len(test_run)
-                  if test_run else 0)
+        LOG.debug("Run with rerun, has run: %s",
+                  len(test_run) if test_run else 0)
         if len(test_run) < len(expected_tests):
             expected_tests = TestDescription.remove_test(expected_tests,
                                                          test_run)
             if not expected_tests:
                 LOG.debug("No tests to re-run, all tests executed at least "
                           "once.")
+                return
             if self.rerun_using_test_file:
                 self._rerun_file(expected_tests, listener)
             else:
                 self._rerun_serially(expected_tests, listener)
 
-    def _make_test_file(self, expected_tests, test_file_path):
+    def _make_test_file(self, expected_tests):
         file_name = 'xdevice_testFile_%s.txt' % self.runner.suite_name
-        file_path = os.path.join(test_file_path, file_name)
+        file_path_open, file_path = tempfile.mkstemp(
+            prefix="test_file_", suffix=".txt", dir=self.config.report_path)
         try:
-            file_path_open = os.open(file_path, os.O_WRONLY | os.O_CREAT |
-                                     os.O_APPEND, FilePermission.mode_755)
-            with os.fdopen(file_path_open, "a") as file_desc:
-                for test in expected_tests:
-                    file_desc.write("%s#%s" % (test.class_name,
-                                               test.test_name))
-                    file_desc.write("\n")
-                    file_desc.flush()
+            with os.fdopen(file_path_open, "w") as file_desc:
+                file_desc.write("".join(
+                    "%s#%s\n" % (test.class_name, test.test_name)
+                    for test in expected_tests))
         except(IOError, ValueError) as err_msg:
             LOG.exception("Error for make long command file: ", err_msg,
                           exc_info=False, error_no="03200")
         return file_name, file_path
 
     def _rerun_file(self, expected_tests, listener):
-        test_file_path = tempfile.mkdtemp(prefix="test_file_",
-                                          dir=self.config.report_path)
-        file_name, file_path = self._make_test_file(
-            expected_tests, test_file_path)
-        self.config.device.push_file(file_path, ON_DEVICE_TEST_DIR_LOCATION)
+        file_name, file_path = self._make_test_file(expected_tests)
         file_path_on_device = ''.join((ON_DEVICE_TEST_DIR_LOCATION, file_name))
+        try:
+            self.config.device.push_file(file_path, file_path_on_device)
+        finally:
+            os.remove(file_path)
         self.runner.add_instrumentation_arg("testFile", file_path_on_device)
         self.runner.junit_para = ""
-        LOG.debug("Ready to rerun file, expect run: %s" % len(expected_tests))
+        LOG.debug("Ready to rerun file, expect run: %s", len(expected_tests))
         test_run = self._run_tests(listener)
-        LOG.debug("Rerun file, has run: %s" % len(test_run))
-        self.config.device.execute_shell_command("rm %s" % file_path_on_device)
+        LOG.debug("Rerun file, has run: %s", len(test_run))
+        if file_path_on_device not in self.device_temp_file_list:
+            self.device_temp_file_list.append(file_path_on_device)
         if len(test_run) < len(expected_tests):
             expected_tests = TestDescription.remove_test(expected_tests,
                                                          test_run)
             if not expected_tests:
                 LOG.debug("Rerun textFile success")
+                return
             self._rerun_serially(expected_tests, listener)
-        shutil.rmtree(test_file_path)
 
     def _rerun_serially(self, expected_tests, listener):
-        LOG.debug("Rerun serially, expected run: %s" % len(expected_tests))
+        LOG.debug("Rerun serially, expected run: %s", len(expected_tests))
         self.runner.remove_instrumentation_arg("testFile")
         for test in expected_tests:
             self.runner.class_name = test.class_name
@@ -1386,32 +1509,42 @@ class DexJunitDriver(IDriver):
 
     def _junit_clear(self):
         _lock_screen(self.config.device)
-        self.config.device.execute_shell_command(
+        self._clear_device_temp_files(
             "rm -r /%s/%s/%s" % ("data", "local", "ajur"))
         for temp_file in self.temp_file_list:
             if os.path.exists(temp_file):
                 os.remove(temp_file)
         self.temp_file_list.clear()
 
+    def _clear_device_temp_files(self, *commands):
+        commands = list(commands)
+        if self.device_temp_file_list:
+            commands.append(
+                "rm -f %s" % " ".join(self.device_temp_file_list))
+            self.device_temp_file_list.clear()
+        # one shell round trip for all the cleanups
+        if commands:
+            self.config.device.execute_shell_command("; ".join(commands))
+
     def _get_driver_config(self, json_config):
+        driver = json_config.get_driver()
         self.config.remote_path = get_config_value(
-            'device-test-path', json_config.get_driver(),
+            'device-test-path', driver,
             default="/%s/%s" % ("data", "tmp"), is_list=False)
         module_name = get_config_value(
-            'module-name', json_config.get_driver(), False)
+            'module-name', driver, False)
         if module_name:
             self.config.module_name = module_name
         else:
             raise ParamError("Can't find module_name.", error_no="03201")
 
-        rerun = get_config_value('rerun', json_config.get_driver(), False)
+        rerun = get_config_value('rerun', driver, False)
         if isinstance(rerun, bool):
             self.rerun = rerun
         elif rerun == "False" or rerun == "false":
             self.rerun = False
 
-        timeout_config = get_config_value('shell-timeout',
-                                          json_config.get_driver(), False)
+        timeout_config = get_config_value('shell-timeout', driver, False)
         if timeout_config:
             self.config.timeout = int(timeout_config)
         else:
@@ -1444,30 +1577,22 @@ class DexJunitDriver(IDriver):
                     LOG.warning(
                         " [%s] is not a valid file" % json_file_list[0])
                     return
-                file_open = os.open(json_file_list[0], os.O_RDONLY,
-                                    stat.S_IWUSR | stat.S_IRUSR)
-                with os.fdopen(file_open, "r") as file_handler:
-                    json_data = json.load(file_handler)
-                exclude_list = json_data.get(
-                    DeviceTestType.dex_junit_test, [])
-
-                from xdevice import Variables
+                exclude_rules = _load_exclude_rules(
+                    json_file_list[0], DeviceTestType.dex_junit_test)
+
+                module_name = request.get_module_name()
                 exclude_file = os.path.join(
-                    self.config.report_path, '{}_exclude.txt'.format(
-                        request.get_module_name()))
-                for exclude in exclude_list:
-                    if request.get_module_name() not in exclude:
-                        continue
+                    self.config.report_path,
+                    '{}_exclude.txt'.format(module_name))
+                if module_name in exclude_rules:
                     exclude_file_open = os.open(
-                        exclude_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                        FilePermission.mode_755)
-                    with os.fdopen(exclude_file_open, "a") as file_handler:
-                        filter_list = exclude.get(request.get_module_name())
+                        exclude_file, _WRITE_FLAGS, _FILE_MODE)
+                    with os.fdopen(exclude_file_open, "w") as file_handler:
+                        filter_list = exclude_rules[module_name]
                         if isinstance(filter_list, list):
-                            file_handler.writelines(
-                                ["%s\n" % item.strip() for item in filter_list
-                                 if item.strip()])
-                        break
+                            file_handler.write("".join(
+                                "%s\n" % item for item in map(
+                                    str.strip, filter_list) if item))
                 if os.path.exists(exclude_file):
                     self.temp_file_list.append(exclude_file)
                     self.config.testargs['test-file-exclude-filter'] \
@@ -1488,19 +1613,13 @@ class RemoteDexRunner:
         self.class_name = None
         self.test_name = None
         self.rerun_attempt = FAILED_RUN_TEST_ATTEMPTS
+        # parser plugins don't change while running, look them up only once
+        self.parser_classes = [parser.__class__ for parser in get_plugin(
+            Plugin.PARSER, CommonParserType.junit)[:1]]
 
     def run(self, listener):
         handler = self._get_shell_handler(listener)
-        command = "export BOOTCLASSPATH=$BOOTCLASSPATH:" \
-                  "{remote_path}/{module_name};cd {remote_path}; " \
-                  "app_process -cp {remote_path}/{module_name} / " \
-                  "ohos.testkit.runner.JUnitRunner {junit_para}{arg_list}" \
-                  " --rawLog true --coverage false " \
-                  "--classpathToScan {remote_path}/{module_name}".format(
-                   remote_path=self.config.remote_path,
-                   module_name=self.config.module_name,
-                   junit_para=self.junit_para,
-                   arg_list=self.get_args_command())
+        command = self._get_run_command(self.junit_para)
 
         try:
             self.config.device.execute_shell_command(
@@ -1527,16 +1646,7 @@ class RemoteDexRunner:
             listener_copy.append(test_tracker)
             handler = self._get_shell_handler(listener_copy)
             try:
-                command = "export BOOTCLASSPATH=$BOOTCLASSPATH:" \
-                          "{remote_path}/{module_name};cd {remote_path}; " \
-                          "app_process -cp {remote_path}/{module_name} / " \
-                          "ohos.testkit.runner.JUnitRunner {arg_list} " \
-                          "--rawLog true --coverage false " \
-                          "--classpathToScan " \
-                          "{remote_path}/{module_name}".format(
-                           remote_path=self.config.remote_path,
-                           module_name=self.config.module_name,
-                           arg_list=self.get_args_command())
+                command = self._get_run_command()
                 self.config.device.execute_shell_command(
                     command, timeout=self.config.timeout,
                     receiver=handler, retry=0)
@@ -1565,30 +1675,29 @@ class RemoteDexRunner:
         self.arg_list[name] = value
 
     def remove_instrumentation_arg(self, name):
-        if not name:
-            return
-        if name in self.arg_list:
-            del self.arg_list[name]
+        if name:
+            self.arg_list.pop(name, None)
 
     def get_args_command(self):
-        args_commands = ""
-        for key, value in self.arg_list.items():
-            args_commands = "%s --%s %s" % (args_commands, key, value)
+        args_commands = [" --%s %s" % (key, value)
+                         for key, value in self.arg_list.items()]
         if self.class_name and self.test_name:
-            args_commands = "%s --class %s#%s" % (args_commands,
-                                                  self.class_name,
-                                                  self.test_name)
+            args_commands.append(" --class %s#%s" % (self.class_name,
+                                                     self.test_name))
         elif self.class_name:
-            args_commands = "%s --class %s" % (args_commands, self.class_name)
-        return args_commands
+            args_commands.append(" --class %s" % self.class_name)
+        return "".join(args_commands)
+
+    def _get_run_command(self, junit_para=""):
+        return _DEX_JUNIT_COMMAND_TEMPLATE.format(
+            remote_path=self.config.remote_path,
+            module_name=self.config.module_name,
+            junit_para=junit_para, arg_list=self.get_args_command())
 
     def _get_shell_handler(self, listener):
-        parsers = get_plugin(Plugin.PARSER, CommonParserType.junit)
-        if parsers:
-            parsers = parsers[:1]
         parser_instances = []
-        for parser in parsers:
-            parser_instance = parser.__class__()
+        for parser_class in self.parser_classes:
+            parser_instance = parser_class()
             parser_instance.suite_name = self.suite_name
             parser_instance.listeners = listener
             parser_instances.append(parser_instance)
@@ -1612,33 +1721,27 @@ class DexTestDriver(IDriver):
         pass
 
     def __execute__(self, request):
-        try:
-            LOG.debug("Start execute xdevice extension DexTest")
+        LOG.debug("Start execute xdevice extension DexTest")
 
-            self.config = request.config
-            self.config.target_test_path = DEFAULT_TEST_PATH
-            self.config.device = request.config.environment.devices[0]
+        self.config = request.config
+        self.config.target_test_path = DEFAULT_TEST_PATH
+        self.config.device = request.config.environment.devices[0]
 
-            suite_file = request.root.source.source_file
-            if not suite_file:
-                LOG.error("Test source '%s' not exists" %
-                          request.root.source.source_string, error_no="00110")
-                return
+        suite_file = request.root.source.source_file
+        if not suite_file:
+            LOG.error("Test source '%s' not exists" %
+                      request.root.source.source_string, error_no="00110")
+            return
 
-            LOG.debug("Testsuite FilePath: %s" % suite_file)
-            serial = request.config.device.__get_serial__()
-            device_log_file = get_device_log_file(request.config.report_path,
-                                                  serial)
-            device_log_file_open = os.open(device_log_file, os.O_WRONLY |
-                                           os.O_CREAT | os.O_APPEND,
-                                           FilePermission.mode_755)
-            with os.fdopen(device_log_file_open, "a") as file_pipe:
-                self.config.device.start_catch_device_log(log_file_pipe=file_pipe)
-                self._init_junit_test()
-                self._run_junit_test(suite_file)
-                file_pipe.flush()
-        finally:
-            self.config.device.stop_catch_device_log()
+        LOG.debug("Testsuite FilePath: %s" % suite_file)
+        serial = request.config.device.__get_serial__()
+        device_log_file = get_device_log_file(request.config.report_path,
+                                              serial)
+        with _catch_device_log(self.config.device, device_log_file) \
+                as log_file_pipe:
+            self.config.device.start_catch_device_log(log_file_pipe)
+            self._init_junit_test()
+            self._run_junit_test(suite_file)
 
     def _init_junit_test(self):
         cmd = "target mount" \
@@ -1720,28 +1823,17 @@ class DexTestDriver(IDriver):
                 LOG.error("Source code root path is empty.", error_no="03202")
                 strip_num = 0
             else:
-                build_variant_outpath = os.path.join(
-                    Variables.source_code_rootpath, "out",
-                    self.config.build_variant)
-                strip_num = len(build_variant_outpath.split(os.sep)) - 1
-
-            command = "cd %s; rm -rf %s.xml; chmod +x *; " \
-                      "export BOOTCLASSPATH=%s%s:$BOOTCLASSPATH;" \
-                      "export GCOV_PREFIX=%s; export GCOV_PREFIX_STRIP=%d;" \
-                      " app_process %s%s %s" \
-                      % (
-                          target_test_path, filename, target_test_path,
-                          filename,
-                          target_test_path, strip_num,
-                          target_test_path, filename, testpara)
+                strip_num = _get_gcov_prefix_strip(
+                    Variables.source_code_rootpath, self.config.build_variant)
+
+            command = _DEX_TEST_COVERAGE_COMMAND_TEMPLATE % (
+                target_test_path, filename, target_test_path, filename,
+                target_test_path, strip_num,
+                target_test_path, filename, testpara)
         else:
-            command = "cd %s; rm -rf %s.xml; chmod +x *; " \
-                      "export BOOTCLASSPATH=%s%s:$BOOTCLASSPATH;" \
-                      " app_process %s%s %s" \
-                      % (
-                          target_test_path, filename, target_test_path,
-                          filename,
-                          target_test_path, filename, testpara)
+            command = _DEX_TEST_COMMAND_TEMPLATE % (
+                target_test_path, filename, target_test_path, filename,
+                target_test_path, filename, testpara)
 
         LOG.info("Command: %s" % command)
         sh_file_name, file_path = \
@@ -1768,7 +1860,12 @@ class DexTestDriver(IDriver):
             if not getattr("exception", "error_no", ""):
                 setattr(exception, "error_no", "03203")
             return_message = str(exception.args)
-        shutil.rmtree(long_command_path)
+        # the directory only holds the command file written above
+        try:
+            os.remove(file_path)
+            os.rmdir(long_command_path)
+        except OSError as _:
+            shutil.rmtree(long_command_path, ignore_errors=True)
         return return_message
 
     @staticmethod
@@ -1776,11 +1873,9 @@ class DexTestDriver(IDriver):
         sh_file_name = '%s.sh' % filename
         file_path = os.path.join(longcommand_path, sh_file_name)
         try:
-            file_path_open = os.open(file_path, os.O_WRONLY | os.O_CREAT |
-                                     os.O_APPEND, FilePermission.mode_755)
-            with os.fdopen(file_path_open, "a") as file_desc:
+            file_path_open = os.open(file_path, _WRITE_FLAGS, _FILE_MODE)
+            with os.fdopen(file_path_open, "w") as file_desc:
                 file_desc.write(command)
-                file_desc.flush()
         except(IOError, ValueError) as err_msg:
             LOG.exception("Error for make long command file: ", err_msg,
                           exc_info=False, error_no="03200")
@@ -1812,43 +1907,38 @@ class HapTestDriver(IDriver):
         pass
 
     def __execute__(self, request):
-        try:
-            LOG.debug("Start execute xdevice extension HapTest")
+        LOG.debug("Start execute xdevice extension HapTest")
 
-            self.config = request.config
-            self.config.target_test_path = DEFAULT_TEST_PATH
-            self.config.device = request.config.environment.devices[0]
+        self.config = request.config
+        self.config.target_test_path = DEFAULT_TEST_PATH
+        self.config.device = request.config.environment.devices[0]
 
-            suite_file = request.root.source.source_file
-            if not suite_file:
-                LOG.error("Test source '%s' not exists" %
-                          request.root.source.source_string, error_no="00110")
-                return
+        suite_file = request.root.source.source_file
+        if not suite_file:
+            LOG.error("Test source '%s' not exists" %
+                      request.root.source.source_string, error_no="00110")
+            return
 
-            LOG.debug("Testsuite FilePath: %s" % suite_file)
-            package_name, ability_name = self._get_package_and_ability_name(
-                suite_file)
-            self.package_name = package_name
-            self.ability_name = ability_name
-            self.activity_name = "%s.MainAbilityShellActivity" % \
-                                 self.package_name
-            self.config.test_hap_out_path = \
-                "/data/data/%s/files/test/result/" % self.package_name
-            self.config.test_suite_timeout = 300 * 1000
-
-            serial = request.config.device.__get_serial__()
-            device_log_file = get_device_log_file(request.config.report_path,
-                                                  serial)
-            device_log_file_open = os.open(device_log_file, os.O_WRONLY |
-                                           os.O_CREAT | os.O_APPEND,
-                                           FilePermission.mode_755)
-            with os.fdopen(device_log_file_open, "a")as file_pipe:
-                self.config.device.start_catch_device_log(hilog_file_pipe=file_pipe)
-                self._init_junit_test()
-                self._run_junit_test(suite_file)
-                file_pipe.flush()
-        finally:
-            self.config.device.stop_catch_device_log()
+        LOG.debug("Testsuite FilePath: %s" % suite_file)
+        package_name, ability_name = self._get_package_and_ability_name(
+            suite_file)
+        self.package_name = package_name
+        self.ability_name = ability_name
+        self.activity_name = "%s.MainAbilityShellActivity" % \
+                             self.package_name
+        self.config.test_hap_out_path = \
+            "/data/data/%s/files/test/result/" % self.package_name
+        self.config.test_suite_timeout = 300 * 1000
+
+        serial = request.config.device.__get_serial__()
+        device_log_file = get_device_log_file(request.config.report_path,
+                                              serial)
+        with _catch_device_log(self.config.device, device_log_file) \
+                as hilog_file_pipe:
+            self.config.device.start_catch_device_log(
+                hilog_file_pipe=hilog_file_pipe)
+            self._init_junit_test()
+            self._run_junit_test(suite_file)
 
     def _init_junit_test(self):
         cmd = "target mount" \
@@ -2004,10 +2094,8 @@ class HapTestDriver(IDriver):
                     receiver=display_receiver,
                     timeout=self.config.test_suite_timeout)
             else:
-                build_variant_outpath = os.path.join(
-                    Variables.source_code_rootpath, "out",
-                    self.config.build_variant)
-                strip_num = len(build_variant_outpath.split(os.sep)) - 1
+                strip_num = _get_gcov_prefix_strip(
+                    Variables.source_code_rootpath, self.config.build_variant)
                 self.config.device.execute_shell_command(
                     "cd %s; export GCOV_PREFIX=%s; "
                     "export GCOV_PREFIX_STRIP=%d; "
@@ -2028,20 +2116,22 @@ class HapTestDriver(IDriver):
         return return_message
 
     def _check_hap_finished(self, target_test_path):
-        run_timeout = True
-        sleep_duration = 3
         target_file = os.path.join(target_test_path,
                                    ZunitConst.jtest_status_filename)
-        for _ in range(
-                int(self.config.test_suite_timeout / (1000 * sleep_duration))):
-            check_value = self.config.device.is_file_exist(target_file)
-            LOG.info("%s state: %s", self.config.device.device_sn,
-                     self.config.device.test_device_state.value)
-            if not check_value:
-                time.sleep(sleep_duration)
-                continue
-            run_timeout = False
-            break
+        wait_seconds = int(self.config.test_suite_timeout / 1000)
+        LOG.info("%s state: %s", self.config.device.device_sn,
+                 self.config.device.test_device_state.value)
+        # wait for the status file on the device in one shell command
+        # instead of polling it from the host
+        command = "i=0; while [ ! -f %s ] && [ $i -lt %d ]; do sleep 1; " \
+                  "i=$((i+1)); done; [ -f %s ] && echo 0" % (
+                      target_file, wait_seconds, target_file)
+        try:
+            output = self.config.device.execute_shell_command(
+                command, timeout=(wait_seconds + 30) * 1000, retry=0)
+        except ShellCommandUnresponsiveException as _:
+            output = ""
+        run_timeout = not (output and output.split()[0] == "0")
         if run_timeout:
             return_code = False
             LOG.error("HAP Testcase executed timeout or exception, please "
@@ -2064,54 +2154,30 @@ class HapTestDriver(IDriver):
         ability_name = ""
 
         if os.path.exists(hap_filepath):
-            filename = os.path.basename(hap_filepath)
-
-            # unzip the hap file
-            hap_bak_path = os.path.abspath(
-                os.path.join(os.path.dirname(hap_filepath),
-                             "%s.bak" % filename))
+            # read config.json straight from the hap file
             try:
                 with zipfile.ZipFile(hap_filepath) as zf_desc:
-                    zf_desc.extractall(path=hap_bak_path)
+                    load_dict = json.loads(zf_desc.read("config.json"))
+            except KeyError:
+                LOG.debug("File config.json not exists in %s" % hap_filepath)
+                return package_name, ability_name
             except RuntimeError as error:
                 LOG.error(error, error_no="03206")
-
-            # verify config.json file
-            app_profile_path = os.path.join(hap_bak_path,
-                                            "config.json")
-            if not os.path.exists(app_profile_path):
-                LOG.debug("File %s not exists" % app_profile_path)
-                return package_name, ability_name
-
-            if os.path.isdir(app_profile_path):
-                LOG.debug("%s is a folder, and not a file" % app_profile_path)
                 return package_name, ability_name
 
             # get package_name and ability_name value.
-            app_profile_path_open = os.open(app_profile_path, os.O_RDONLY,
-                                            stat.S_IWUSR | stat.S_IRUSR)
-            with os.fdopen(app_profile_path_open, 'r') as load_f:
-                load_dict = json.load(load_f)
             profile_list = load_dict.values()
             for profile in profile_list:
                 package_name = profile.get("package")
                 if not package_name:
                     continue
+                # the first ability of the first package is the entry
                 abilities = profile.get("abilities")
-                for abilitie in abilities:
-                    abilities_name = abilitie.get("name")
-                    if abilities_name.startswith("."):
-                        ability_name = ''.join(
-                            (package_name,
-                             abilities_name[abilities_name.find("."):]))
-                    else:
-                        ability_name = abilities_name
-                    break
+                if abilities:
+                    ability_name = abilities[0].get("name")
+                    if ability_name.startswith("."):
+                        ability_name = ''.join((package_name, ability_name))
                 break
-
-            # delete hap_bak_path
-            if os.path.exists(hap_bak_path):
-                shutil.rmtree(hap_bak_path)
         else:
             LOG.debug("File %s not exists" % hap_filepath)
 
@@ -2132,6 +2198,7 @@ class JSUnitTestDriver(IDriver):
         self.timeout = 30 * 1000
         self.start_time = None
         self.result = ""
+        self.existing_result = ""
         self.error_message = ""
         self.kits = []
         self.config = None
@@ -2184,23 +2251,16 @@ class JSUnitTestDriver(IDriver):
                 get_module_name(),
                 "device_hilog")
 
-            device_log_open = os.open(device_log, os.O_WRONLY | os.O_CREAT |
-                                      os.O_APPEND, FilePermission.mode_755)
-            hilog_open = os.open(hilog, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                                 FilePermission.mode_755)
-            with os.fdopen(device_log_open, "a") as log_file_pipe, \
-                    os.fdopen(hilog_open, "a") as hilog_file_pipe:
+            with _open_log_file(device_log) as log_file_pipe, \
+                    _open_log_file(hilog) as hilog_file_pipe:
                 self.config.device.start_catch_device_log(log_file_pipe,
                                                           hilog_file_pipe)
                 # unlock device
                 disable_keyguard(self.config.device)
                 self._run_jsunit(config_file, hilog, request)
-
-                log_file_pipe.flush()
-                hilog_file_pipe.flush()
             if self.xml_output == "false":
                 self.start_time = time.time()
-                json_config = JsonParser(config_file)
+                json_config = _get_json_config(config_file)
                 timeout_config = get_config_value('test-timeout',
                                                   json_config.get_driver(),
                                                   False, 60000)
@@ -2239,21 +2299,33 @@ class JSUnitTestDriver(IDriver):
 
     @classmethod
     def _insert_suite_end(cls, label_list, message_list):
+        # indexes of the messages which need a suite end in front of them
+        insert_indexes = []
         for i in range(len(label_list[0])):
             if label_list[0][i] != 1:  # skipp
                 continue
             # check the start label, then peek next position
             if i + 1 == len(label_list[0]):  # next position at the tail
-                message_list.insert(-1, _ACE_LOG_MARKER + ": [suite end]\n")
+                insert_indexes.append(len(message_list) - 1)
                 LOG.warning("there is no suite end")
                 continue
             if label_list[0][i + 1] != 1:  # 0 present the end label
                 continue
-            message_list.insert(label_list[1][i + 1],
-                                _ACE_LOG_MARKER + ": [suite end]\n")
+            insert_indexes.append(label_list[1][i + 1])
             LOG.warning("there is no suite end")
-            for j in range(i + 1, len(label_list[1])):
-                label_list[1][j] += 1  # move the index to next
+        if not insert_indexes:
+            return
+        # rebuild the message list once instead of inserting one by one
+        suite_end = _ACE_LOG_MARKER + ": [suite end]\n"
+        messages = []
+        insert_index_iter = iter(insert_indexes)
+        insert_index = next(insert_index_iter)
+        for index, message in enumerate(message_list):
+            while insert_index == index:
+                messages.append(suite_end)
+                insert_index = next(insert_index_iter, None)
+            messages.append(message)
+        message_list[:] = messages
 
     def _analyse_tests(self, request, result_message, expect_tests_dict):
         listener_copy = request.listeners.copy()
@@ -2277,77 +2349,80 @@ class JSUnitTestDriver(IDriver):
     def _parse_suite_info(cls, suite_info):
         tests_dict = dict()
         test_count = 0
-        if suite_info:
-            json_str = "".join(suite_info)
-            LOG.debug("Suites info: %s" % json_str)
-            try:
-                suite_dict_list = json.loads(json_str).get("suites", [])
-                for suite_dict in suite_dict_list:
-                    for class_name, test_name_dict_list in suite_dict.items():
-                        tests_dict.update({class_name.strip(): []})
-                        for test_name_dict in test_name_dict_list:
-                            for test_name in test_name_dict.values():
-                                test = TestDescription(class_name.strip(),
-                                                       test_name.strip())
-                                tests_dict.get(class_name.strip()).append(test)
-                                test_count += 1
-            except json.decoder.JSONDecodeError as json_error:
-                LOG.warning("Suites info is invalid: %s" % json_error)
-        LOG.debug("Collect suite count is %s, test count is %s" %
-                  (len(tests_dict), test_count))
+        if not suite_info:
+            LOG.debug("Collect suite count is 0, test count is 0")
+            return tests_dict
+        json_str = "".join(suite_info)
+        LOG.debug("Suites info: %s", json_str)
+        try:
+            suite_dict_list = json_loads(json_str).get("suites", [])
+            for suite_dict in suite_dict_list:
+                for class_name, test_name_dict_list in suite_dict.items():
+                    class_name = class_name.strip()
+                    tests = [TestDescription(class_name, test_name.strip())
+                             for test_name_dict in test_name_dict_list
+                             for test_name in test_name_dict.values()]
+                    tests_dict[class_name] = tests
+                    test_count += len(tests)
+        except json.decoder.JSONDecodeError as json_error:
+            LOG.warning("Suites info is invalid: %s" % json_error)
+        LOG.debug("Collect suite count is %s, test count is %s",
+                  len(tests_dict), test_count)
         return tests_dict
 
     def read_device_log(self, device_log_file, result_message):
         device_log_file_open = os.open(device_log_file, os.O_RDONLY,
                                        stat.S_IWUSR | stat.S_IRUSR)
-        if not result_message:
-            result_message = ""
+        _advise_sequential_read(device_log_file_open)
+        message_list = [result_message] if result_message else []
+        report_name = ""
         self.start_time = time.time()
-        with os.fdopen(device_log_file_open, "r", encoding='utf-8') \
-                as file_read_pipe:
-            while True:
-                try:
-                    data = file_read_pipe.readline()
-                    result_message += data
-                    report_name = ""
-                    if re.match(r'.*\[create report]*', data):
-                        _, index = re.match(r'.*\[create report]*', data).\
-                            span()
-                    if result_message.find("[create report]") != -1 or \
-                            int(time.time() - int(self.start_time)) > \
-                            self.timeout:
+        with os.fdopen(device_log_file_open, "r", encoding='utf-8',
+                       errors='ignore') as file_read_pipe:
+            # only complete lines are matched, a marker line that is still
+            # being written is carried over to the next read
+            log_reader = _LogLineReader(file_read_pipe)
+            is_report_created = False
+            while not is_report_created:
+                for data in log_reader.read_lines():
+                    message_list.append(data)
+                    matcher = _CREATE_REPORT_PATTERN.match(data)
+                    if matcher:
+                        report_name = data[matcher.end():].strip()
+                        is_report_created = True
                         break
-                except (UnicodeDecodeError, UnicodeError) as error:
-                    LOG.warning("While read log file: %s" % error)
-        return result_message, report_name
+                else:
+                    # self.timeout is in milliseconds
+                    if time.time() - self.start_time > self.timeout / 1000:
+                        message_list.append(log_reader.unfinished_line)
+                        break
+                    # wait for log write to file instead of spinning
+                    time.sleep(_LOG_POLL_INTERVAL)
+        return "".join(message_list), report_name
 
     def read_device_log_timeout(self, device_log_file,
                                 message_list, timeout):
         LOG.info("The timeout is {} seconds".format(timeout))
-        pattern = "^\\d{2}-\\d{2}\\s+\\d{2}:\\d{2}:\\d{2}\\.\\d{3}\\s+(\\d+)"
-        while time.time() - self.start_time <= timeout:
-            with open(device_log_file, "r", encoding='utf-8',
-                      errors='ignore') as file_read_pipe:
-                pid = ""
-                message_list.clear()
-                label_list = [[], []]  # [-1, 1 ..] [line1, line2 ..]
-                suite_info = []
-                while True:
-                    try:
-                        line = file_read_pipe.readline()
-                    except UnicodeError as error:
-                        LOG.warning("While read log file: %s" % error)
-                    if not line:
-                        time.sleep(5)  # wait for log write to file
-                        break
-                    if line.lower().find(_ACE_LOG_MARKER + ":") != -1:
+        pid = ""
+        message_list.clear()
+        label_list = [[], []]  # [-1, 1 ..] [line1, line2 ..]
+        suite_info = []
+        # keep the log open and only parse what was written since last poll
+        with open(device_log_file, "r", encoding='utf-8',
+                  errors='ignore', buffering=_LOG_READ_SIZE) \
+                as file_read_pipe:
+            _advise_sequential_read(file_read_pipe.fileno())
+            log_reader = _LogLineReader(file_read_pipe)
+            while True:
+                for line in log_reader.read_lines():
+                    if _ACE_LOG_TAG in line or _ACE_LOG_LOWER_TAG in line:
                         if "[suites info]" in line:
-                            _, pos = re.match(".+\\[suites info]", line).span()
+                            _, pos = _SUITES_INFO_PATTERN.match(line).span()
                             suite_info.append(line[pos:].strip())
 
                         if "[start] start run suites" in line:  # 发现了任务开始标签
-                            pid, is_update = \
-                                self._init_suites_start(line, pattern, pid)
+                            pid, is_update = self._init_suites_start(
+                                line, _HILOG_PID_PATTERN, pid)
                             if is_update:
                                 message_list.clear()
                                 label_list[0].clear()
@@ -2358,21 +2433,25 @@ class JSUnitTestDriver(IDriver):
                         if "[suite end]" in line:
                             label_list[0].append(-1)
                             label_list[1].append(len(message_list) - 1)
-                        if "[suite start]" in line:
+                        elif "[suite start]" in line:
                             label_list[0].append(1)
                             label_list[1].append(len(message_list) - 1)
                         if "[end] run suites end" in line:
                             LOG.info("Find the end mark then analysis result")
-                            LOG.debug("current JSApp pid= %s" % pid)
+                            LOG.debug("current JSApp pid= %s", pid)
                             return label_list, suite_info, True
-        else:
-            LOG.error("Hjsunit run timeout {}s reached".format(timeout))
-            LOG.debug("current JSApp pid= %s" % pid)
-            return label_list, suite_info, False
+                remaining = timeout - (time.time() - self.start_time)
+                if remaining <= 0:
+                    break
+                # wait for log write to file
+                time.sleep(min(remaining, _LOG_POLL_INTERVAL))
+        LOG.error("Hjsunit run timeout {}s reached".format(timeout))
+        LOG.debug("current JSApp pid= %s", pid)
+        return label_list, suite_info, False
 
     @classmethod
     def _init_suites_start(cls, line, pattern, pid):
-        matcher = re.match(pattern, line.strip())
+        matcher = pattern.match(line.strip())
         if matcher and matcher.group(1):
             pid = matcher.group(1)
             return pid, True
@@ -2386,7 +2465,7 @@ class JSUnitTestDriver(IDriver):
                 "Error: Test cases don't exist %s." % config_file,
                 error_no="00102")
 
-        json_config = JsonParser(config_file)
+        json_config = _get_json_config(config_file)
         self.kits = get_kit_instances(json_config,
                                       self.config.resource_path,
                                       self.config.testcases_path)
@@ -2424,23 +2503,22 @@ class JSUnitTestDriver(IDriver):
             "rm -r /%s/%s/%s/%s" % ("data", "local", "tmp", "ajur"))
 
     def _get_driver_config(self, json_config):
-        package = get_config_value('package', json_config.get_driver(), False)
+        driver = json_config.get_driver()
+        package = get_config_value('package', driver, False)
         runner = "ohos.testkit.runner.Runner"
 
         default_ability = "ohos.testkit.runner.EntryAbility"
-        ability_name = get_config_value('abilityName', json_config.
-                                        get_driver(), False, default_ability)
+        ability_name = get_config_value('abilityName', driver, False,
+                                        default_ability)
 
         self.xml_output = get_xml_output(self.config, json_config)
-        timeout_config = get_config_value('native-test-timeout',
-                                          json_config.get_driver(), False)
+        timeout_config = get_config_value('native-test-timeout', driver, False)
         #  for historical reasons, this strategy is adopted
         #  priority: native-test-timeout higher than shell-timeout
         if not timeout_config:
-            timeout_config = get_config_value('shell-timeout',
-                                              json_config.get_driver(), False)
+            timeout_config = get_config_value('shell-timeout', driver, False)
         testcase_timeout = get_config_value(
-            'testcase-timeout', json_config.get_driver(), False, 5000)
+            'testcase-timeout', driver, False, 5000)
         if timeout_config:
             self.timeout = int(timeout_config)
 
@@ -2502,7 +2580,7 @@ class JSUnitTestDriver(IDriver):
                     "Error: Test cases don't exist %s." % config_file,
                     error_no="00102")
 
-            json_config = JsonParser(config_file)
+            json_config = _get_json_config(config_file)
             self.kits = get_kit_instances(json_config,
                                           self.config.resource_path,
                                           self.config.testcases_path)
@@ -2517,10 +2595,7 @@ class JSUnitTestDriver(IDriver):
                 get_module_name(),
                 "device_hilog")
 
-            hilog_open = os.open(hilog, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                                 0o755)
-
-            with os.fdopen(hilog_open, "a") as hilog_file_pipe:
+            with _open_log_file(hilog) as hilog_file_pipe:
                 self.config.device.clear_crash_log()
                 self.config.device.start_catch_device_log(
                     hilog_file_pipe=hilog_file_pipe)
@@ -2553,13 +2628,13 @@ class JSUnitTestDriver(IDriver):
             "rm -r /%s/%s/%s/%s" % ("data", "local", "tmp", "ajur"))
 
     def _get_driver_config_outer(self, json_config):
-        package = get_config_value('package', json_config.get_driver(), False)
+        driver = json_config.get_driver()
+        package = get_config_value('package', driver, False)
         default_ability = "{}.MainAbility".format(package)
-        ability_name = get_config_value('abilityName', json_config.
-                                        get_driver(), False, default_ability)
+        ability_name = get_config_value('abilityName', driver, False,
+                                        default_ability)
         self.xml_output = get_xml_output(self.config, json_config)
-        timeout_config = get_config_value('native-test-timeout',
-                                          json_config.get_driver(), False)
+        timeout_config = get_config_value('native-test-timeout', driver, False)
         if timeout_config:
             self.timeout = int(timeout_config)
 
@@ -2569,7 +2644,13 @@ class JSUnitTestDriver(IDriver):
         return package, ability_name
 
     def __result__(self):
-        return self.result if os.path.exists(self.result) else ""
+        # a result file that was found once stays, skip stat on next calls
+        if self.result and self.result == self.existing_result:
+            return self.result
+        if not os.path.exists(self.result):
+            return ""
+        self.existing_result = self.result
+        return self.result
 
 
 @Plugin(type=Plugin.DRIVER, id=DeviceTestType.ltp_posix_test)
@@ -2578,6 +2659,7 @@ class LTPPosixTestDriver(IDriver):
         self.timeout = 80 * 1000
         self.start_time = None
         self.result = ""
+        self.existing_result = ""
         self.error_message = ""
         self.kits = []
         self.config = None
@@ -2635,7 +2717,7 @@ class LTPPosixTestDriver(IDriver):
                     "Error: Test cases don't exist %s." % config_file,
                     error_no="00102")
 
-            json_config = JsonParser(config_file)
+            json_config = _get_json_config(config_file)
             self.kits = get_kit_instances(json_config,
                                           self.config.resource_path,
                                           self.config.testcases_path)
@@ -2654,37 +2736,53 @@ class LTPPosixTestDriver(IDriver):
                 get_module_name(),
                 "device_hilog")
 
-            hilog_open = os.open(hilog, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
-                                 0o755)
-            with os.fdopen(hilog_open, "a") as hilog_file_pipe:
-                for test_bin in test_list:
-                    if not test_bin.endswith(".run-test"):
-                        continue
-                    listeners = request.listeners
-                    for listener in listeners:
-                        listener.device_sn = self.config.device.device_sn
-                    parsers = get_plugin(Plugin.PARSER,
-                                         "OpenSourceTest")
-                    parser_instances = []
-                    for parser in parsers:
-                        parser_instance = parser.__class__()
-                        parser_instance.suite_name = request.root.source.\
-                            test_name
-                        parser_instance.test_name = test_bin.replace("./", "")
-                        parser_instance.listeners = listeners
-                        parser_instances.append(parser_instance)
-                    self.handler = ShellHandler(parser_instances)
-                    self.handler.add_process_method(_ltp_output_method)
-                    result_message = self.config.device.connector_command(
-                        "shell {}".format(test_bin))
-                    LOG.info("get result from command {}".
-                             format(result_message))
-                    process_command_ret(result_message, self.handler)
+            test_bins = [test_bin for test_bin in test_list
+                         if test_bin.endswith(".run-test")]
+            listeners = request.listeners
+            for listener in listeners:
+                listener.device_sn = self.config.device.device_sn
+            parsers = get_plugin(Plugin.PARSER, "OpenSourceTest")
+            concurrency = _get_positive_int_config(
+                'test-concurrency', json_config.get_driver(), 1)
+
+            with _open_log_file(hilog) as hilog_file_pipe, \
+                    ThreadPoolExecutor(concurrency) as executor:
+                # test binaries may run on the device at the same time, but
+                # their results are parsed in order on this thread only
+                futures = [executor.submit(
+                    self.config.device.connector_command,
+                    "shell {}".format(test_bin)) for test_bin in test_bins]
+                try:
+                    for test_bin, future in zip(test_bins, futures):
+                        result_message = future.result()
+                        parser_instances = []
+                        for parser in parsers:
+                            parser_instance = parser.__class__()
+                            parser_instance.suite_name = request.root.\
+                                source.test_name
+                            parser_instance.test_name = \
+                                test_bin.replace("./", "")
+                            parser_instance.listeners = listeners
+                            parser_instances.append(parser_instance)
+                        self.handler = ShellHandler(parser_instances)
+                        self.handler.add_process_method(_ltp_output_method)
+                        LOG.info("get result from command {}".
+                                 format(result_message))
+                        process_command_ret(result_message, self.handler)
+                finally:
+                    # stop binaries which are not started yet after an error
+                    for future in futures:
+                        future.cancel()
         finally:
             do_module_kit_teardown(request)
 
     def __result__(self):
-        return self.result if os.path.exists(self.result) else ""
+        if self.result and self.result == self.existing_result:
+            return self.result
+        if not os.path.exists(self.result):
+            return ""
+        self.existing_result = self.result
+        return self.result
 
 
 def _lock_screen(device):
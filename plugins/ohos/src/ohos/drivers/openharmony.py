@@ -513,10 +513,8 @@ class OHJSUnitTestRunner:
         self.arg_list[name] = value
 
     def remove_arg(self, name):
-        if not name:
-            return
-        if name in self.arg_list:
-            del self.arg_list[name]
+        if name:
+            self.arg_list.pop(name, None)
 
     def get_args_command(self):
         args_commands = ""
@@ -18,8 +18,6 @@
 
 from setuptools import setup
 
-INSTALL_REQUIRES = []
-
 
 def main():
     setup(name='xdevice',
@@ -50,7 +48,6 @@ def main():
               ]
           },
           zip_safe=False,
-          install_requires=INSTALL_REQUIRES,
           )
 
 
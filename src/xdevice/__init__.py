@@ -16,11 +16,10 @@
 # limitations under the License.
 #
 
-import pkg_resources
-
 from .variables import Variables
 from _core.plugin import Plugin
 from _core.plugin import get_plugin
+from _core.plugin import defer_entry_points
 from _core.logger import platform_logger
 from _core.interface import IDriver
 from _core.interface import IDevice
@@ -104,6 +103,7 @@ from _core.utils import get_shell_handler
 from _core.utils import get_decode
 from _core.utils import start_standing_subprocess
 from _core.utils import stop_standing_subprocess
+from _core.utils import json_loads
 from _core.environment.manager_env import DeviceSelectionOption
 from _core.environment.manager_env import EnvironmentManager
 from _core.environment.device_state import DeviceEvent
@@ -224,6 +224,7 @@ __all__ = [
     "get_decode",
     "start_standing_subprocess",
     "stop_standing_subprocess",
+    "json_loads",
     "ExecInfo",
     "ResultReporter",
     "DataHelper",
@@ -235,9 +236,7 @@ def _load_external_plugins():
     plugins = [Plugin.SCHEDULER, Plugin.DRIVER, Plugin.DEVICE, Plugin.LOG,
                Plugin.PARSER, Plugin.LISTENER, Plugin.TEST_KIT, Plugin.MANAGER,
                Plugin.REPORTER]
-    for plugin_group in plugins:
-        for entry_point in pkg_resources.iter_entry_points(group=plugin_group):
-            entry_point.load()
+    defer_entry_points(plugins)
     return
 
 
@@ -23,6 +23,8 @@ from _core.logger import platform_logger
 
 LOG = platform_logger("ResourceManager")
 DEFAULT_TIMEOUT = "300"
+# parsed resource data by (xml file path, xml mtime, target name)
+_RESOURCE_DATA_CACHE = dict()
 
 
 class ResourceManager(object):
@@ -147,9 +149,13 @@ class ResourceManager(object):
         if not os.path.exists(xml_filepath):
             return data_dic, resource_dir
 
-        data_dic = self.get_resource_data(xml_filepath, target_name)
-        resource_dir = os.path.abspath(os.path.dirname(xml_filepath))
-        return data_dic, resource_dir
+        cache_key = (xml_filepath, os.path.getmtime(xml_filepath),
+                     target_name)
+        if cache_key not in _RESOURCE_DATA_CACHE:
+            data_dic = self.get_resource_data(xml_filepath, target_name)
+            resource_dir = os.path.abspath(os.path.dirname(xml_filepath))
+            _RESOURCE_DATA_CACHE[cache_key] = data_dic, resource_dir
+        return _RESOURCE_DATA_CACHE[cache_key]
 
     def process_preparer_data(self, data_dic, resource_dir, device):
         if "preparer" in data_dic.keys():
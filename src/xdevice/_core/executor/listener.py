@@ -139,11 +139,13 @@ class TestDescription(object):
         return self.class_name == other.class_name and \
                self.test_name == other.test_name
 
+    def __hash__(self):
+        return hash((self.class_name, self.test_name))
+
     @classmethod
     def remove_test(cls, tests, execute_tests):
-        for execute_test in execute_tests:
-            if execute_test in tests:
-                tests.remove(execute_test)
+        execute_tests = set(execute_tests)
+        tests[:] = [test for test in tests if test not in execute_tests]
         return tests
 
 
@@ -372,9 +374,12 @@ class CollectingTestListener(IListener):
 
     def __init__(self):
         self.tests = []
+        self.test_num = 0
 
     def __started__(self, lifecycle, test_result):
-        if lifecycle == LifeCycle.TestCase:
+        if lifecycle == LifeCycle.TestSuite:
+            self.test_num = getattr(test_result, "test_num", 0) or 0
+        elif lifecycle == LifeCycle.TestCase:
             if not test_result.test_class or not test_result.test_name:
                 return
             test = TestDescription(test_result.test_class,
@@ -394,6 +399,14 @@ class CollectingTestListener(IListener):
     def get_current_run_results(self):
         return self.tests
 
+    def get_expected_test_num(self):
+        return self.test_num
+
+    def clear_current_run_results(self):
+        # results already handed out keep their own list
+        self.tests = []
+        self.test_num = 0
+
 
 @Plugin(type=Plugin.LISTENER, id=ListenerType.collect_lite)
 class CollectingLiteGTestListener(IListener):
@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+import threading
 from inspect import signature
 
 from _core.interface import IDriver
@@ -28,10 +29,18 @@ from _core.interface import IDeviceManager
 from _core.interface import IReporter
 
 __all__ = ["Config", "Plugin", "get_plugin", "set_plugin_params",
-           "get_all_plugins", "clear_plugin_cache"]
+           "get_all_plugins", "clear_plugin_cache", "get_entry_points",
+           "defer_entry_points"]
 
 # plugins dict
 _PLUGINS = dict()
+# entry points dict, group name as key
+_ENTRY_POINTS = dict()
+# plugin types whose entry points are loaded on the first lookup
+_DEFERRED_PLUGIN_TYPES = []
+# deferred plugin types whose entry points are being imported
+_LOADING_PLUGIN_TYPES = set()
+_DEFERRED_PLUGIN_LOCK = threading.RLock()
 # plugin config name
 _DEFAULT_CONFIG_NAME = "_plugin_config_"
 
@@ -163,6 +172,7 @@ def get_plugin(plugin_type, plugin_id=None):
     :param plugin_id: plugin id
     :return:  the instance list of plugin
     """
+    _load_deferred_entry_points(plugin_type)
     if plugin_id is None:
         plugins = []
         for key in _PLUGINS:
@@ -202,6 +212,7 @@ def get_all_plugins():
     """
     Get all plugins
     """
+    _load_deferred_entry_points()
     return dict(_PLUGINS)
 
 
@@ -210,3 +221,82 @@ def clear_plugin_cache():
     Clear all cached plugins
     """
     _PLUGINS.clear()
+
+
+def get_entry_points(group):
+    """
+    Get the entry points registered in the group, all groups are scanned
+    in one pass and cached since installed distributions don't change
+    while running
+    :param group: entry point group name
+    :return: the entry point list of the group
+    """
+    if not _ENTRY_POINTS:
+        _ENTRY_POINTS.update(_scan_entry_points())
+    return _ENTRY_POINTS.get(group, [])
+
+
+def _scan_entry_points():
+    entry_points_dict = dict()
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # python 3.7 has no importlib.metadata
+        import pkg_resources
+        for dist in pkg_resources.working_set:
+            for group, entry_map in dist.get_entry_map().items():
+                entry_points_dict.setdefault(group, []).extend(
+                    entry_map.values())
+        return entry_points_dict
+
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, "select"):
+        # entry points are parsed once, select only filters them
+        for group in all_entry_points.groups:
+            entry_points_dict[group] = list(
+                all_entry_points.select(group=group))
+    else:
+        # python 3.8 and 3.9 return a dict of group to entry points
+        for group, group_entry_points in all_entry_points.items():
+            entry_points_dict.setdefault(group, []).extend(
+                group_entry_points)
+    return entry_points_dict
+
+
+def defer_entry_points(plugin_types):
+    """
+    Defer loading the entry points of the plugin types until the plugins
+    of that type are looked up, so that modules of unused plugins are not
+    imported
+    :param plugin_types: plugin type list, the same as entry point groups
+    """
+    with _DEFERRED_PLUGIN_LOCK:
+        for plugin_type in plugin_types:
+            if plugin_type not in _DEFERRED_PLUGIN_TYPES:
+                _DEFERRED_PLUGIN_TYPES.append(plugin_type)
+
+
+def _load_deferred_entry_points(plugin_type=None):
+    if not _DEFERRED_PLUGIN_TYPES:
+        return
+
+    # other threads wait until the plugins of the group are registered
+    with _DEFERRED_PLUGIN_LOCK:
+        if plugin_type is None:
+            plugin_types = list(_DEFERRED_PLUGIN_TYPES)
+        elif plugin_type in _DEFERRED_PLUGIN_TYPES:
+            plugin_types = [plugin_type]
+        else:
+            return
+
+        for group in plugin_types:
+            # plugin modules may look up plugins while being imported
+            if group in _LOADING_PLUGIN_TYPES:
+                continue
+            _LOADING_PLUGIN_TYPES.add(group)
+            try:
+                for entry_point in get_entry_points(group):
+                    entry_point.load()
+                _DEFERRED_PLUGIN_TYPES.remove(group)
+            finally:
+                _LOADING_PLUGIN_TYPES.discard(group)
@@ -19,7 +19,6 @@
 import os
 import re
 import stat
-import json
 import time
 import platform
 import subprocess
@@ -27,6 +26,7 @@ import signal
 from threading import Timer
 
 from _core.utils import get_file_absolute_path
+from _core.utils import json_loads
 from _core.logger import platform_logger
 from _core.exception import ParamError
 from _core.constants import DeviceTestType
@@ -165,15 +165,13 @@ def gtest_para_parse(gtest_paras, runner, request):
         if para.strip() == 'all-test-file-exclude-filter':
             json_file_list = gtest_paras.get("all-test-file-exclude-filter")
             if json_file_list:
-                flags = os.O_RDONLY
-                modes = stat.S_IWUSR | stat.S_IRUSR
-                with os.fdopen(os.open(json_file_list[0], flags, modes),
-                               "r") as file_handler:
-                    json_data = json.load(file_handler)
+                with open(json_file_list[0], "rb") as file_handler:
+                    json_data = json_loads(file_handler.read())
                 exclude_list = json_data.get(DeviceTestType.cpp_test)
+                module_name = request.get_module_name()
                 for exclude in exclude_list:
-                    if request.get_module_name() in exclude:
-                        case_list = exclude.get(request.get_module_name())
+                    if module_name in exclude:
+                        case_list = exclude.get(module_name)
                         runner.add_instrumentation_arg(
                             "gtest_filter",
                             "%s%s" % ("-", ":".join(case_list)))
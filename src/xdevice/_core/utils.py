@@ -41,6 +41,12 @@ from _core.plugin import Plugin
 from _core.constants import ModeType
 from _core.constants import ConfigConst
 
+try:
+    # orjson is optional, it only speeds up loading json data
+    from orjson import loads as json_loads
+except ModuleNotFoundError as _:
+    json_loads = json.loads
+
 LOG = platform_logger("Utils")
 
 
@@ -543,7 +549,8 @@ def get_kit_instances(json_config, resource_path="", testcases_path=""):
 
     # get kit instances
     for kit in json_config.config.kits:
-        kit["paths"] = [resource_path, testcases_path]
+        # json_config may be shared, leave its kit dicts untouched
+        kit = dict(kit, paths=[resource_path, testcases_path])
         kit_type = kit.get("type", "")
         device_name = kit.get("device_name", None)
         if get_plugin(plugin_type=Plugin.TEST_KIT, plugin_id=kit_type):
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+#
+# Copyright (c) 2022 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import sys
+
+_ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# run against the source tree, xdevice and the ohos extension not installed
+for _src_path in (os.path.join(_ROOT_PATH, "plugins", "ohos", "src"),
+                  os.path.join(_ROOT_PATH, "src", "xdevice"),
+                  os.path.join(_ROOT_PATH, "src")):
+    if _src_path not in sys.path:
+        sys.path.insert(0, _src_path)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+#
+# Copyright (c) 2022 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from ohos.drivers import drivers
+from ohos.drivers.drivers import JSUnitTestDriver
+
+_LINE_TEMPLATE = "01-01 00:00:00.000  1234  1240 I A03d00/JSApp: %s\n"
+
+
+class _FakeClock:
+    """
+    Stands in for the time module of the drivers, every sleep advances the
+    clock and lets the test append what the device writes meanwhile
+    """
+
+    def __init__(self, log_file, writes=()):
+        self.now = 1000.0
+        self.log_file = log_file
+        self.writes = list(writes)
+        self.sleep_count = 0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleep_count += 1
+        self.now += seconds
+        if self.writes:
+            with open(self.log_file, "a", encoding="utf-8") as log_pipe:
+                log_pipe.write(self.writes.pop(0))
+
+
+@pytest.fixture
+def hilog(tmp_path):
+    return str(tmp_path / "device_hilog.log")
+
+
+def _use_clock(monkeypatch, clock):
+    monkeypatch.setattr(drivers, "time", SimpleNamespace(
+        time=clock.time, sleep=clock.sleep, time_ns=lambda: 0))
+
+
+def test_tail_picks_up_lines_written_while_waiting(hilog, monkeypatch):
+    with open(hilog, "w", encoding="utf-8") as log_pipe:
+        log_pipe.write(_LINE_TEMPLATE % "[start] start run suites")
+        # the device has written half of the next line only
+        log_pipe.write((_LINE_TEMPLATE % "[suite start]SuiteA")[:50])
+    clock = _FakeClock(hilog, [
+        (_LINE_TEMPLATE % "[suite start]SuiteA")[50:],
+        _LINE_TEMPLATE % "[end] run suites end"])
+    _use_clock(monkeypatch, clock)
+    driver = JSUnitTestDriver()
+    driver.start_time = clock.time()
+    message_list = []
+
+    label_list, suite_info, is_suites_end = driver.read_device_log_timeout(
+        hilog, message_list, 60)
+
+    assert is_suites_end
+    assert suite_info == []
+    assert message_list == [
+        _LINE_TEMPLATE % "[start] start run suites",
+        _LINE_TEMPLATE % "[suite start]SuiteA",
+        _LINE_TEMPLATE % "[end] run suites end"]
+    assert label_list == [[1], [1]]
+    assert clock.sleep_count == 2
+
+
+def test_tail_stops_at_timeout_without_end_mark(hilog, monkeypatch):
+    with open(hilog, "w", encoding="utf-8") as log_pipe:
+        log_pipe.write(_LINE_TEMPLATE % "[start] start run suites")
+        log_pipe.write(_LINE_TEMPLATE % "[suite start]SuiteA")
+    clock = _FakeClock(hilog)
+    _use_clock(monkeypatch, clock)
+    driver = JSUnitTestDriver()
+    driver.start_time = clock.time()
+    message_list = []
+
+    label_list, _, is_suites_end = driver.read_device_log_timeout(
+        hilog, message_list, 3)
+
+    assert not is_suites_end
+    assert label_list == [[1], [1]]
+    assert len(message_list) == 2
+    assert clock.now - driver.start_time <= 3 + drivers._LOG_POLL_INTERVAL
+
+
+def test_create_report_marker_split_across_reads(hilog, monkeypatch):
+    with open(hilog, "w", encoding="utf-8") as log_pipe:
+        log_pipe.write("line one\nline two [create re")
+    clock = _FakeClock(hilog, ["port]report.xml\nline three\n"])
+    _use_clock(monkeypatch, clock)
+    driver = JSUnitTestDriver()
+
+    result_message, report_name = driver.read_device_log(hilog, "")
+
+    assert report_name == "report.xml"
+    assert result_message == \
+        "line one\nline two [create report]report.xml\n"
+
+
+def _insert_suite_end_one_by_one(label_list, message_list):
+    # the former implementation, kept as reference for the one pass rebuild
+    suite_end = drivers._ACE_LOG_MARKER + ": [suite end]\n"
+    for i in range(len(label_list[0])):
+        if label_list[0][i] != 1:
+            continue
+        if i + 1 == len(label_list[0]):
+            message_list.insert(-1, suite_end)
+            continue
+        if label_list[0][i + 1] != 1:
+            continue
+        message_list.insert(label_list[1][i + 1], suite_end)
+        for j in range(i + 1, len(label_list[1])):
+            label_list[1][j] += 1
+
+
+def test_insert_suite_end_for_consecutive_and_trailing_starts():
+    suite_end = drivers._ACE_LOG_MARKER + ": [suite end]\n"
+    message_list = ["start A\n", "case A\n", "start B\n", "case B\n",
+                    "end B\n", "start C\n", "case C\n"]
+    label_list = [[1, 1, -1, 1], [0, 2, 4, 5]]
+
+    JSUnitTestDriver._insert_suite_end(label_list, message_list)
+
+    assert message_list == [
+        "start A\n", "case A\n", suite_end, "start B\n", "case B\n",
+        "end B\n", "start C\n", suite_end, "case C\n"]
+
+
+def test_insert_suite_end_keeps_complete_suites():
+    message_list = ["start A\n", "end A\n"]
+
+    JSUnitTestDriver._insert_suite_end([[1, -1], [0, 1]], message_list)
+
+    assert message_list == ["start A\n", "end A\n"]
+
+
+def test_insert_suite_end_matches_inserting_one_by_one():
+    rand = random.Random(2022)
+    for _ in range(200):
+        message_list = []
+        label_list = [[], []]
+        for index in range(rand.randint(1, 30)):
+            message_list.append("line %s\n" % index)
+            label = rand.choice((1, -1, 0, 0))
+            if label:
+                label_list[0].append(label)
+                label_list[1].append(index)
+        expected = list(message_list)
+        _insert_suite_end_one_by_one(
+            [list(label_list[0]), list(label_list[1])], expected)
+
+        JSUnitTestDriver._insert_suite_end(label_list, message_list)
+
+        assert message_list == expected
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+#
+# Copyright (c) 2022 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from types import SimpleNamespace
+
+import xdevice
+from xdevice import LifeCycle
+
+from ohos.drivers.drivers import JUnitTestDriver
+
+
+class _FakeRunner:
+    def __init__(self, test_num, tests):
+        self.test_num = test_num
+        self.tests = tests
+        self.run_count = 0
+
+    def run(self, listeners):
+        self.run_count += 1
+        suite_result = SimpleNamespace(test_num=self.test_num)
+        for listener in listeners:
+            listener.__started__(LifeCycle.TestSuite, suite_result)
+        for class_name, test_name in self.tests:
+            test_result = SimpleNamespace(test_class=class_name,
+                                          test_name=test_name)
+            for listener in listeners:
+                listener.__started__(LifeCycle.TestCase, test_result)
+
+
+def _create_driver(test_num, tests, collected_tests):
+    driver = JUnitTestDriver()
+    driver.config = SimpleNamespace(xml_output="false", nohup=False,
+                                    package="com.example.test")
+    driver.runner = _FakeRunner(test_num, tests)
+    driver.collect_count = 0
+    driver.rerun_calls = []
+
+    def collect_test_to_run():
+        driver.collect_count += 1
+        return collected_tests
+
+    def rerun_missing_tests(listener, expected_tests, test_run):
+        driver.rerun_calls.append((listener, expected_tests, list(test_run)))
+
+    driver._check_package = lambda: True
+    driver._collect_test_to_run = collect_test_to_run
+    driver._rerun_missing_tests = rerun_missing_tests
+    return driver
+
+
+def test_all_reported_tests_run_skips_collection():
+    driver = _create_driver(2, [("A", "t1"), ("A", "t2")], [])
+    driver._do_test_run([])
+    assert driver.runner.run_count == 1
+    assert driver.collect_count == 0
+    assert not driver.rerun_calls
+    assert not driver.is_no_test
+
+
+def test_missing_tests_are_collected_and_rerun():
+    collected = [xdevice.TestDescription("A", "t1"),
+                 xdevice.TestDescription("A", "t2"),
+                 xdevice.TestDescription("B", "t3")]
+    driver = _create_driver(3, [("A", "t1"), ("A", "t2")], collected)
+    listener = []
+    driver._do_test_run(listener)
+    assert driver.collect_count == 1
+    assert len(driver.rerun_calls) == 1
+    rerun_listener, expected_tests, test_run = driver.rerun_calls[0]
+    assert rerun_listener is listener
+    assert expected_tests is collected
+    assert test_run == [xdevice.TestDescription("A", "t1"),
+                        xdevice.TestDescription("A", "t2")]
+
+
+def test_unknown_test_num_falls_back_to_collection():
+    driver = _create_driver(0, [("A", "t1")], [])
+    driver._do_test_run([])
+    assert driver.collect_count == 1
+    assert not driver.rerun_calls
+    assert driver.is_no_test
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+#
+# Copyright (c) 2022 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import xdevice
+
+
+def _description(class_name, test_name):
+    return xdevice.TestDescription(class_name, test_name)
+
+
+def test_equal_descriptions_share_a_hash():
+    first = _description("ExampleTest", "testAdd")
+    second = _description("ExampleTest", "testAdd")
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert second in {first}
+    assert _description("ExampleTest", "testSub") not in {first}
+    assert _description("OtherTest", "testAdd") not in {first}
+
+
+def test_remove_test_filters_the_list_in_place():
+    tests = [_description("ExampleTest", "test%s" % index)
+             for index in range(5)]
+    execute_tests = [_description("ExampleTest", "test3"),
+                     _description("ExampleTest", "test0"),
+                     _description("OtherTest", "test1")]
+
+    remain_tests = xdevice.TestDescription.remove_test(tests, execute_tests)
+
+    assert remain_tests is tests
+    assert [test.test_name for test in tests] == ["test1", "test2", "test4"]
+
+
+def test_remove_test_accepts_an_iterator():
+    tests = [_description("ExampleTest", "testAdd")]
+
+    xdevice.TestDescription.remove_test(
+        tests, iter([_description("ExampleTest", "testAdd")]))
+
+    assert tests == []
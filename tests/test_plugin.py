@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+#
+# Copyright (c) 2022 Huawei Device Co., Ltd.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+from _core import plugin
+
+
+class _EntryPoint:
+    def __init__(self, group, loaded, on_load=None):
+        self.group = group
+        self.loaded = loaded
+        self.on_load = on_load
+
+    def load(self):
+        if self.on_load:
+            self.on_load()
+        self.loaded.append(self.group)
+
+
+@pytest.fixture
+def deferred(monkeypatch):
+    monkeypatch.setattr(plugin, "_DEFERRED_PLUGIN_TYPES", [])
+    monkeypatch.setattr(plugin, "_LOADING_PLUGIN_TYPES", set())
+    return plugin._DEFERRED_PLUGIN_TYPES
+
+
+def _use_entry_points(monkeypatch, entry_points):
+    monkeypatch.setattr(plugin, "get_entry_points",
+                        lambda group: entry_points.get(group, []))
+
+
+def test_only_the_requested_group_is_loaded_once(deferred, monkeypatch):
+    loaded = []
+    _use_entry_points(monkeypatch, {
+        "driver": [_EntryPoint("driver", loaded)],
+        "parser": [_EntryPoint("parser", loaded)]})
+    plugin.defer_entry_points(["driver", "parser", "driver"])
+
+    plugin._load_deferred_entry_points("driver")
+    plugin._load_deferred_entry_points("driver")
+
+    assert loaded == ["driver"]
+    assert deferred == ["parser"]
+
+    plugin._load_deferred_entry_points()
+
+    assert loaded == ["driver", "parser"]
+    assert deferred == []
+
+
+def test_lookup_while_loading_does_not_load_again(deferred, monkeypatch):
+    loaded = []
+    states = []
+
+    def lookup_during_import():
+        plugin._load_deferred_entry_points("driver")
+        states.append(list(deferred))
+
+    _use_entry_points(monkeypatch, {"driver": [
+        _EntryPoint("driver", loaded, lookup_during_import)]})
+    plugin.defer_entry_points(["driver"])
+
+    plugin._load_deferred_entry_points("driver")
+
+    assert loaded == ["driver"]
+    # the group is still deferred until all of its plugins are registered
+    assert states == [["driver"]]
+    assert deferred == []
+    assert not plugin._LOADING_PLUGIN_TYPES
+
+
+def test_failed_load_keeps_the_group_deferred(deferred, monkeypatch):
+    def fail():
+        raise ImportError("broken plugin")
+
+    _use_entry_points(monkeypatch, {"driver": [
+        _EntryPoint("driver", [], fail)]})
+    plugin.defer_entry_points(["driver"])
+
+    with pytest.raises(ImportError):
+        plugin._load_deferred_entry_points("driver")
+
+    assert deferred == ["driver"]
+    assert not plugin._LOADING_PLUGIN_TYPES